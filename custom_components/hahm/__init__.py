@@ -5,6 +5,7 @@ https://github.com/danielperna84/hahomematic
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from homeassistant.config_entries import ConfigEntry
@@ -34,12 +35,21 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         enable_sensors_for_system_variables=config_entry.options.get(
             CONF_ENABLE_SENSORS_FOR_SYSTEM_VARIABLES, False
         ),
+        options=config_entry.options,
     ).get_control_unit()
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][config_entry.entry_id] = control_unit
-    hass.config_entries.async_setup_platforms(config_entry, HAHM_PLATFORMS)
-    await control_unit.start()
     await async_setup_services(hass)
+    # Set up the platforms before starting the control unit, so the entities
+    # are added as soon as their devices are created.
+    control_unit.async_start_in_background(
+        asyncio.gather(
+            *(
+                hass.config_entries.async_forward_entry_setup(config_entry, platform)
+                for platform in HAHM_PLATFORMS
+            )
+        )
+    )
     return True
 
 
@@ -47,7 +57,8 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     """Unload a config entry."""
     control_unit = hass.data[DOMAIN][config_entry.entry_id]
     await control_unit.stop()
-    control_unit.central.clear_all()
+    if control_unit.central is not None:
+        control_unit.central.clear_all()
     if unload_ok := await hass.config_entries.async_unload_platforms(
         config_entry, HAHM_PLATFORMS
     ):
@@ -0,0 +1,116 @@
+"""Registry of commands waiting for the acknowledgement of the device."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+
+class AckTimeoutError(HomeAssistantError):
+    """Error to indicate a command, that was not acknowledged in time."""
+
+
+class _Waiter:
+    """Future of a command waiting for an acknowledgement."""
+
+    def __init__(
+        self, future: asyncio.Future, match: Callable[[Any], bool] | None
+    ) -> None:
+        self.future = future
+        self.match = match
+
+
+class AckRegistry:
+    """
+    Futures waiting for inbound events, registered by key.
+    An event resolves the futures of its key, so waiting costs nothing
+    until the event arrives.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._waiters: dict[Hashable, list[_Waiter]] = {}
+
+    def is_waiting(self, key: Hashable) -> bool:
+        """Return if a command waits for the key."""
+        return key in self._waiters
+
+    @callback
+    def expect(
+        self, key: Hashable, match: Callable[[Any], bool] | None = None
+    ) -> tuple[Hashable, asyncio.Future]:
+        """
+        Register a future for the next event of a key.
+        Must be called before the command is sent.
+        """
+        future = self._hass.loop.create_future()
+        self._waiters.setdefault(key, []).append(_Waiter(future, match))
+        return key, future
+
+    def resolve(self, key: Hashable, value: Any = None) -> None:
+        """Resolve the futures of a key. Safe to call from any thread."""
+        if key in self._waiters:
+            self._hass.loop.call_soon_threadsafe(self._async_resolve, key, value)
+
+    @callback
+    def _async_resolve(self, key: Hashable, value: Any) -> None:
+        """Resolve the futures of a key, whose match accepts the value."""
+        if (waiters := self._waiters.get(key)) is None:
+            return
+        for waiter in list(waiters):
+            if waiter.match is not None and not waiter.match(value):
+                continue
+            if not waiter.future.done():
+                waiter.future.set_result(value)
+            waiters.remove(waiter)
+        if not waiters:
+            del self._waiters[key]
+
+    @asynccontextmanager
+    async def async_acknowledged(
+        self,
+        expected: Iterable[tuple[Hashable, asyncio.Future]],
+        timeout: float,
+    ) -> AsyncIterator[None]:
+        """Wait for the expected events after the command is sent."""
+        expected = list(expected)
+        try:
+            yield
+        except BaseException:
+            self.discard(expected)
+            raise
+        if expected:
+            await self.async_wait(expected, timeout)
+
+    async def async_wait(
+        self,
+        expected: Iterable[tuple[Hashable, asyncio.Future]],
+        timeout: float,
+    ) -> None:
+        """Wait for all expected events, raise AckTimeoutError on timeout."""
+        expected = list(expected)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(future for _, future in expected)), timeout
+            )
+        except asyncio.TimeoutError as err:
+            missing = [key for key, future in expected if not future.done()]
+            raise AckTimeoutError(
+                f"No acknowledgement for {missing} within {timeout}s"
+            ) from err
+        finally:
+            self.discard(expected)
+
+    @callback
+    def discard(self, expected: Iterable[tuple[Hashable, asyncio.Future]]) -> None:
+        """Drop expected events, that are no longer awaited."""
+        for key, future in expected:
+            if (waiters := self._waiters.get(key)) is None:
+                continue
+            waiters[:] = [waiter for waiter in waiters if waiter.future is not future]
+            if not waiters:
+                del self._waiters[key]
@@ -1,6 +1,7 @@
 """climate for HAHM."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
 from typing import Any
 
@@ -19,6 +20,9 @@ from .generic_entity import HaHomematicGenericEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+_PARAM_TEMPERATURE_MINIMUM = "TEMPERATURE_MINIMUM"
+_PARAM_TEMPERATURE_MAXIMUM = "TEMPERATURE_MAXIMUM"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -110,13 +114,64 @@ class HaHomematicClimate(HaHomematicGenericEntity, ClimateEntity):
     @property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
+        if (value := self._get_master_value(_PARAM_TEMPERATURE_MINIMUM)) is not None:
+            return float(value)
         return float(self._hm_entity.min_temp)
 
     @property
     def max_temp(self) -> float:
         """Return the maximum temperature."""
+        if (value := self._get_master_value(_PARAM_TEMPERATURE_MAXIMUM)) is not None:
+            return float(value)
         return float(self._hm_entity.max_temp)
 
+    @property
+    def _master_address(self) -> str:
+        """Return the address of the channel with the MASTER parameters."""
+        address = self._hm_entity.address
+        if ":" in address:
+            return address
+        return f"{address}:{getattr(self._hm_entity, 'channel_no', 1)}"
+
+    def _get_master_value(self, parameter: str) -> Any:
+        """Return a value of the cached MASTER paramset."""
+        if paramset := self._cu.master_paramsets.get_cached(self._master_address):
+            return paramset.get(parameter)
+        return None
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks and read the MASTER paramset."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._cu.async_signal_master_paramset_updated(),
+                self._async_master_paramset_updated,
+            )
+        )
+        # Don't delay adding the entity by the call to the device.
+        self.hass.async_create_task(self._async_load_master_paramset())
+
+    async def _async_load_master_paramset(self) -> None:
+        """Read the MASTER paramset through the cache and update the state."""
+        try:
+            await self._cu.master_paramsets.async_get(
+                self._hm_entity.interface_id, self._master_address
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug(
+                "Reading MASTER paramset of %s failed: %s", self._master_address, err
+            )
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def _async_master_paramset_updated(self, device_address: str) -> None:
+        """Reload the MASTER paramset, if it changed for the device."""
+        if device_address != self._master_address.split(":")[0]:
+            return
+        self.hass.async_create_task(self._async_load_master_paramset())
+
     async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature."""
         await self._hm_entity.set_temperature(**kwargs)
@@ -130,7 +185,7 @@ class HaHomematicClimate(HaHomematicGenericEntity, ClimateEntity):
         await self._hm_entity.set_preset_mode(preset_mode)
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes of the access point."""
         state_attr = super().extra_state_attributes
 
@@ -0,0 +1,168 @@
+"""Compaction of concurrent setValue calls to the same channel."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+PARAMSET_KEY_VALUES = "VALUES"
+# Time to wait for further values of a channel.
+DEFAULT_COMPACTION_WINDOW = 0.02
+
+
+# Parameters, that modify how the following value is applied.
+_MODIFIER_PREFIXES = ("ON_TIME", "RAMP_TIME", "DURATION_")
+
+
+class _PendingValues:
+    """Values of a channel waiting to be sent."""
+
+    def __init__(self, previous: asyncio.Task | None) -> None:
+        self.values: dict[str, Any] = {}
+        self.futures: list[asyncio.Future] = []
+        self.timer: asyncio.TimerHandle | None = None
+        # The flush of the previous values of the channel, sent first.
+        self.previous = previous
+
+
+class SetValueCompactor:
+    """
+    Merges setValue calls to the same channel within a short window into a
+    single putParamset of the VALUES paramset.
+    A single pending value is still sent by setValue. A parameter, that is
+    already pending, is never merged, so it starts a new putParamset, that
+    is sent after the pending values.
+    """
+
+    def __init__(
+        self,
+        set_value: Callable[..., Awaitable[Any]],
+        put_paramset: Callable[[str, str, dict[str, Any]], Awaitable[Any]],
+        window: float = DEFAULT_COMPACTION_WINDOW,
+    ) -> None:
+        self._set_value = set_value
+        self._put_paramset = put_paramset
+        self._window = window
+        self._pending: dict[str, _PendingValues] = {}
+        self._flushes: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.sent = 0
+
+    @property
+    def saved_calls(self) -> int:
+        """Return the number of RPC calls saved by compaction."""
+        return self.calls - self.sent
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the compaction metrics as dict."""
+        return {
+            "set_value_calls": self.calls,
+            "rpc_calls": self.sent,
+            "window_ms": round(self._window * 1000),
+        }
+
+    async def set_value(
+        self, address: str, value_key: str, value: Any, rx_mode: str | None = None
+    ) -> None:
+        """Queue a value of a channel and wait until it is sent."""
+        if rx_mode is not None:
+            # Values with a dedicated receive mode are not merged.
+            self.calls += 1
+            self.sent += 1
+            await self._set_value(address, value_key, value, rx_mode)
+            return
+
+        loop = asyncio.get_running_loop()
+        if (pending := self._pending.get(address)) is not None and (
+            value_key in pending.values
+        ):
+            # Repeated values, e.g. of PRESS_SHORT, are sent one after another.
+            self._start_flush(address)
+            pending = None
+        if pending is None:
+            pending = self._pending[address] = _PendingValues(
+                self._flushes.get(address)
+            )
+            pending.timer = loop.call_later(self._window, self._start_flush, address)
+        pending.values[value_key] = value
+        future = loop.create_future()
+        pending.futures.append(future)
+        self.calls += 1
+        await future
+
+    def _start_flush(self, address: str) -> None:
+        """Send the pending values of a channel in a task."""
+        if (pending := self._pending.pop(address, None)) is None:
+            return
+        if pending.timer:
+            pending.timer.cancel()
+        task = self._flushes[address] = asyncio.get_running_loop().create_task(
+            self._flush(address, pending)
+        )
+        task.add_done_callback(partial(self._flush_done, address))
+
+    def _flush_done(self, address: str, task: asyncio.Task) -> None:
+        """Forget the flush of a channel, when no later flush waits for it."""
+        if self._flushes.get(address) is task:
+            del self._flushes[address]
+
+    async def _flush(self, address: str, pending: _PendingValues) -> None:
+        """Send the pending values of a channel after the previous ones."""
+        try:
+            if pending.previous is not None:
+                await asyncio.wait([pending.previous])
+            self.sent += 1
+            if len(pending.values) == 1:
+                ((value_key, value),) = pending.values.items()
+                await self._set_value(address, value_key, value)
+            else:
+                _LOGGER.debug(
+                    "Merged %i values of %s into putParamset",
+                    len(pending.futures),
+                    address,
+                )
+                await self._put_paramset(
+                    address, PARAMSET_KEY_VALUES, _order_values(pending.values)
+                )
+        except asyncio.CancelledError:
+            for future in pending.futures:
+                future.cancel()
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            for future in pending.futures:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for future in pending.futures:
+            if not future.done():
+                future.set_result(None)
+
+    def cancel(self) -> None:
+        """Drop all pending values."""
+        for pending in self._pending.values():
+            if pending.timer:
+                pending.timer.cancel()
+            for future in pending.futures:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+        for task in self._flushes.values():
+            task.cancel()
+        self._flushes.clear()
+
+
+def _order_values(values: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the values in the order of their calls, but with parameters
+    like ON_TIME or RAMP_TIME before the values they modify.
+    """
+    return dict(
+        sorted(
+            values.items(),
+            key=lambda item: not item[0].startswith(_MODIFIER_PREFIXES),
+        )
+    )
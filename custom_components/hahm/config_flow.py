@@ -30,6 +30,7 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
+from .compaction import DEFAULT_COMPACTION_WINDOW
 from .const import (
     ATTR_ADD_ANOTHER_INTERFACE,
     ATTR_INSTANCE_NAME,
@@ -39,9 +40,43 @@ from .const import (
     ATTR_PATH,
     CONF_ENABLE_SENSORS_FOR_SYSTEM_VARIABLES,
     CONF_ENABLE_VIRTUAL_CHANNELS,
+    CONF_FILTER_EXCLUDE_CHANNELS,
+    CONF_FILTER_EXCLUDE_DEVICE_TYPES,
+    CONF_FILTER_EXCLUDE_INTERFACES,
+    CONF_FILTER_EXCLUDE_PARAMETERS,
+    CONF_FILTER_EXCLUDE_SYSTEM_VARIABLES,
+    CONF_FILTER_INCLUDE_DEVICE_TYPES,
+    CONF_FILTER_INCLUDE_PARAMETERS,
+    CONF_POLL_BUDGET,
+    CONF_POLL_DEVICE_TYPES,
+    CONF_POLL_INTERFACES,
+    CONF_POLL_INTERVAL,
+    CONF_POLL_PARAMETERS,
+    CONF_POLL_WITHOUT_EVENTS,
+    CONF_RPC_COMPACTION_WINDOW,
+    CONF_RPC_PARAMSET_WRITE_TIMEOUT,
+    CONF_RPC_POOL_IDLE_TIMEOUT,
+    CONF_RPC_POOL_SIZE,
+    CONF_RPC_READ_TIMEOUT,
+    CONF_RPC_WRITE_TIMEOUT,
+    CONF_SAMPLING_ENABLED,
+    CONF_SAMPLING_HEARTBEAT,
+    CONF_SAMPLING_MIN_ABS_DELTA,
+    CONF_SAMPLING_MIN_INTERVAL,
+    CONF_SAMPLING_MIN_RELATIVE_DELTA,
+    CONF_WAIT_FOR_ACK,
     DOMAIN,
 )
 from .control_unit import ControlConfig
+from .polling import DEFAULT_POLL_BUDGET, DEFAULT_POLL_INTERVAL
+from .rpc_transport import (
+    DEFAULT_DEADLINES,
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    OPERATION_PARAMSET_WRITE,
+    OPERATION_READ,
+    OPERATION_WRITE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -203,7 +238,7 @@ class HahmOptionsFlowHandler(config_entries.OptionsFlow):
         """Manage the hahm devices options."""
         if user_input is not None:
             self.options.update(user_input)
-            return self.async_create_entry(title="", data=self.options)
+            return await self.async_step_hahm_entity_filter()
 
         return self.async_show_form(
             step_id="hahm_devices",
@@ -221,6 +256,183 @@ class HahmOptionsFlowHandler(config_entries.OptionsFlow):
             ),
         )
 
+    async def async_step_hahm_entity_filter(self, user_input=None):
+        """Manage the hahm entity filter options."""
+        if user_input is not None:
+            self.options.update(user_input)
+            return await self.async_step_hahm_sampling()
+
+        return self.async_show_form(
+            step_id="hahm_entity_filter",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        option,
+                        default=self.options.get(option, ""),
+                    ): str
+                    for option in (
+                        CONF_FILTER_INCLUDE_DEVICE_TYPES,
+                        CONF_FILTER_EXCLUDE_DEVICE_TYPES,
+                        CONF_FILTER_INCLUDE_PARAMETERS,
+                        CONF_FILTER_EXCLUDE_PARAMETERS,
+                        CONF_FILTER_EXCLUDE_CHANNELS,
+                        CONF_FILTER_EXCLUDE_INTERFACES,
+                        CONF_FILTER_EXCLUDE_SYSTEM_VARIABLES,
+                    )
+                }
+            ),
+        )
+
+    async def async_step_hahm_sampling(self, user_input=None):
+        """Manage the sampling options of high-frequency sensors."""
+        if user_input is not None:
+            for option in (
+                CONF_SAMPLING_MIN_INTERVAL,
+                CONF_SAMPLING_MIN_ABS_DELTA,
+                CONF_SAMPLING_MIN_RELATIVE_DELTA,
+                CONF_SAMPLING_HEARTBEAT,
+            ):
+                # Empty fields fall back to the defaults of the device class.
+                self.options.pop(option, None)
+            self.options.update(user_input)
+            return await self.async_step_hahm_rpc()
+
+        return self.async_show_form(
+            step_id="hahm_sampling",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SAMPLING_ENABLED,
+                        default=self.options.get(CONF_SAMPLING_ENABLED, True),
+                    ): bool,
+                    vol.Optional(
+                        CONF_SAMPLING_MIN_INTERVAL,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_SAMPLING_MIN_INTERVAL
+                            )
+                        },
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_SAMPLING_MIN_ABS_DELTA,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_SAMPLING_MIN_ABS_DELTA
+                            )
+                        },
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_SAMPLING_MIN_RELATIVE_DELTA,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_SAMPLING_MIN_RELATIVE_DELTA
+                            )
+                        },
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_SAMPLING_HEARTBEAT,
+                        description={
+                            "suggested_value": self.options.get(CONF_SAMPLING_HEARTBEAT)
+                        },
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+                }
+            ),
+        )
+
+    async def async_step_hahm_rpc(self, user_input=None):
+        """Manage the hahm rpc connection options."""
+        if user_input is not None:
+            self.options.update(user_input)
+            return await self.async_step_hahm_polling()
+
+        return self.async_show_form(
+            step_id="hahm_rpc",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_RPC_POOL_SIZE,
+                        default=self.options.get(CONF_RPC_POOL_SIZE, DEFAULT_POOL_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Optional(
+                        CONF_RPC_POOL_IDLE_TIMEOUT,
+                        default=self.options.get(
+                            CONF_RPC_POOL_IDLE_TIMEOUT, DEFAULT_POOL_IDLE_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_RPC_COMPACTION_WINDOW,
+                        default=self.options.get(
+                            CONF_RPC_COMPACTION_WINDOW,
+                            round(DEFAULT_COMPACTION_WINDOW * 1000),
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Optional(
+                        CONF_RPC_READ_TIMEOUT,
+                        default=self.options.get(
+                            CONF_RPC_READ_TIMEOUT, DEFAULT_DEADLINES[OPERATION_READ]
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=600)),
+                    vol.Optional(
+                        CONF_RPC_WRITE_TIMEOUT,
+                        default=self.options.get(
+                            CONF_RPC_WRITE_TIMEOUT, DEFAULT_DEADLINES[OPERATION_WRITE]
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=600)),
+                    vol.Optional(
+                        CONF_RPC_PARAMSET_WRITE_TIMEOUT,
+                        default=self.options.get(
+                            CONF_RPC_PARAMSET_WRITE_TIMEOUT,
+                            DEFAULT_DEADLINES[OPERATION_PARAMSET_WRITE],
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=600)),
+                    vol.Optional(
+                        CONF_WAIT_FOR_ACK,
+                        default=self.options.get(CONF_WAIT_FOR_ACK, 0),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=600)),
+                }
+            ),
+        )
+
+    async def async_step_hahm_polling(self, user_input=None):
+        """Manage the polling of parameters, that are not pushed."""
+        if user_input is not None:
+            self.options.update(user_input)
+            return self.async_create_entry(title="", data=self.options)
+
+        return self.async_show_form(
+            step_id="hahm_polling",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_POLL_INTERFACES,
+                        default=self.options.get(CONF_POLL_INTERFACES, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_POLL_DEVICE_TYPES,
+                        default=self.options.get(CONF_POLL_DEVICE_TYPES, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_POLL_PARAMETERS,
+                        default=self.options.get(CONF_POLL_PARAMETERS, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_POLL_WITHOUT_EVENTS,
+                        default=self.options.get(CONF_POLL_WITHOUT_EVENTS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_POLL_INTERVAL,
+                        default=self.options.get(
+                            CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=5, max=3600)),
+                    vol.Optional(
+                        CONF_POLL_BUDGET,
+                        default=self.options.get(CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                }
+            ),
+        )
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
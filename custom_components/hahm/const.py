@@ -18,14 +18,56 @@ ATTR_PARAMSET_KEY = "paramset_key"
 ATTR_PATH = "path"
 ATTR_RX_MODE = "rx_mode"
 ATTR_VALUE_TYPE = "value_type"
+ATTR_VALUES = "values"
+ATTR_VIRTUAL_KEY_ADDRESS = "virtual_key_address"
+ATTR_VIRTUAL_KEY_PARAMETER = "virtual_key_parameter"
+ATTR_WAIT_FOR_ACK = "wait_for_ack"
+
+HM_ADDRESS = "ADDRESS"
+HM_FIRMWARE = "FIRMWARE"
+HM_PARENT = "PARENT"
+HM_VERSION = "VERSION"
+
+EVENT_READY = "hahm_ready"
+
+CONF_EVENT_TYPE = "event_type"
+CONF_INTERFACE_ID = "interface_id"
 
 CONF_ENABLE_SENSORS_FOR_SYSTEM_VARIABLES = "enable_sensors_for_system_variables"
 CONF_ENABLE_VIRTUAL_CHANNELS = "enable_virtual_channels"
+CONF_FILTER_EXCLUDE_CHANNELS = "filter_exclude_channels"
+CONF_FILTER_EXCLUDE_DEVICE_TYPES = "filter_exclude_device_types"
+CONF_FILTER_EXCLUDE_INTERFACES = "filter_exclude_interfaces"
+CONF_FILTER_EXCLUDE_PARAMETERS = "filter_exclude_parameters"
+CONF_FILTER_EXCLUDE_SYSTEM_VARIABLES = "filter_exclude_system_variables"
+CONF_FILTER_INCLUDE_DEVICE_TYPES = "filter_include_device_types"
+CONF_FILTER_INCLUDE_PARAMETERS = "filter_include_parameters"
+CONF_SAMPLING_ENABLED = "sampling_enabled"
+CONF_SAMPLING_HEARTBEAT = "sampling_heartbeat"
+CONF_SAMPLING_MIN_ABS_DELTA = "sampling_min_abs_delta"
+CONF_SAMPLING_MIN_INTERVAL = "sampling_min_interval"
+CONF_SAMPLING_MIN_RELATIVE_DELTA = "sampling_min_relative_delta"
+CONF_POLL_BUDGET = "poll_budget"
+CONF_POLL_DEVICE_TYPES = "poll_device_types"
+CONF_POLL_INTERFACES = "poll_interfaces"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_POLL_PARAMETERS = "poll_parameters"
+CONF_POLL_WITHOUT_EVENTS = "poll_without_events"
+CONF_RPC_COMPACTION_WINDOW = "rpc_compaction_window"
+CONF_RPC_PARAMSET_WRITE_TIMEOUT = "rpc_paramset_write_timeout"
+CONF_RPC_POOL_IDLE_TIMEOUT = "rpc_pool_idle_timeout"
+CONF_RPC_POOL_SIZE = "rpc_pool_size"
+CONF_RPC_READ_TIMEOUT = "rpc_read_timeout"
+CONF_RPC_WRITE_TIMEOUT = "rpc_write_timeout"
+CONF_WAIT_FOR_ACK = "wait_for_ack"
 
 SERVICE_PUT_PARAMSET = "put_paramset"
+SERVICE_REFRESH_MASTER_PARAMSET = "refresh_master_paramset"
+SERVICE_SEND_GROUP_VALUE = "send_group_value"
 SERVICE_SET_DEVICE_VALUE = "set_device_value"
 SERVICE_SET_INSTALL_MODE = "set_install_mode"
 SERVICE_SET_VARIABLE_VALUE = "set_variable_value"
+SERVICE_SET_VARIABLE_VALUES = "set_variable_values"
 SERVICE_VIRTUAL_KEY = "virtual_key"
 
 
@@ -6,10 +6,16 @@ https://github.com/danielperna84/hahomematic
 """
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import suppress
 from datetime import timedelta
+from functools import partial
 import logging
+import time
 from types import MappingProxyType
 from typing import Any
+import xmlrpc.client
 
 from hahomematic import config
 from hahomematic.central_unit import CentralConfig, CentralUnit
@@ -20,10 +26,13 @@ from hahomematic.const import (
     ATTR_CALLBACK_PORT,
     ATTR_HOST,
     ATTR_JSON_PORT,
+    ATTR_PARAMETER,
     ATTR_PASSWORD,
     ATTR_PORT,
+    ATTR_SUBTYPE,
     ATTR_TLS,
     ATTR_USERNAME,
+    ATTR_VALUE,
     ATTR_VERIFY_TLS,
     AVAILABLE_HM_PLATFORMS,
     HH_EVENT_DELETE_DEVICES,
@@ -34,34 +43,126 @@ from hahomematic.const import (
     HH_EVENT_RE_ADDED_DEVICE,
     HH_EVENT_REPLACE_DEVICE,
     HH_EVENT_UPDATE_DEVICE,
+    HM_VIRTUAL_REMOTES,
     IP_ANY_V4,
     PORT_ANY,
     HmEventType,
     HmPlatform,
 )
-from hahomematic.entity import BaseEntity
+from hahomematic.entity import BaseEntity, GenericEntity, ImpulseEvent
 from hahomematic.hub import HmHub
 from hahomematic.xml_rpc_server import register_xml_rpc_server
+import voluptuous as vol
 
-from homeassistant.const import CONF_DEVICE_ID
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import aiohttp_client, device_registry as dr
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_PLATFORM,
+    PERCENTAGE,
+    TIME_MILLISECONDS,
+    TIME_SECONDS,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    aiohttp_client,
+    device_registry as dr,
+    entity_registry as er,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.util import slugify
 
+from .ack import AckRegistry
+from .compaction import (
+    DEFAULT_COMPACTION_WINDOW,
+    PARAMSET_KEY_VALUES,
+    SetValueCompactor,
+)
 from .const import (
     ATTR_INSTANCE_NAME,
     ATTR_INTERFACE,
     ATTR_JSON_TLS,
     ATTR_PATH,
+    CONF_EVENT_TYPE,
+    CONF_POLL_BUDGET,
+    CONF_POLL_INTERVAL,
+    CONF_RPC_COMPACTION_WINDOW,
+    CONF_RPC_PARAMSET_WRITE_TIMEOUT,
+    CONF_RPC_POOL_IDLE_TIMEOUT,
+    CONF_RPC_POOL_SIZE,
+    CONF_RPC_READ_TIMEOUT,
+    CONF_RPC_WRITE_TIMEOUT,
+    CONF_WAIT_FOR_ACK,
     DOMAIN,
+    EVENT_READY,
     HAHM_PLATFORMS,
+    HM_ADDRESS,
+    HM_FIRMWARE,
+    HM_PARENT,
+    HM_VERSION,
+)
+from .entity_filter import EntityFilter
+from .event_subscriptions import EventSubscriptions
+from .helper import get_shared_attributes, get_unrecorded_hub_attributes
+from .inbound import LANES, InboundLanes
+from .json_rpc import JsonRpcError, JsonRpcSession
+from .limiter import AdaptiveLimiter
+from .liveness import TICK_INTERVAL, DeviceLiveness
+from .optimistic import DeviceRoundTrips
+from .paramset_cache import PARAMSET_KEY_MASTER, MasterParamsetCache
+from .polling import (
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_POLL_INTERVAL,
+    PollFilter,
+    PollScheduler,
+)
+from .reconnect import get_reconnect_scheduler
+from .rpc_transport import (
+    DEFAULT_DEADLINES,
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    OPERATION_PARAMSET_WRITE,
+    OPERATION_READ,
+    OPERATION_WRITE,
+    PooledTransport,
+    get_server_proxy,
+    install_pooled_transport,
+    stream_call,
 )
+from .trigger_router import get_trigger_router
 
 _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = timedelta(seconds=30)
+# Every n-th hub poll runs a full fetch to discover new system variables.
+FULL_FETCH_INTERVAL = 10
+# Maximum number of parallel setValue calls per interface for group values.
+GROUP_VALUE_CONCURRENCY = 4
+# Keys and types of the paramset description of a parameter.
+_PARAM_OPERATIONS = "OPERATIONS"
+_PARAM_TYPE = "TYPE"
+_PARAM_VALUE_LIST = "VALUE_LIST"
+_TYPE_ACTION = "ACTION"
+_TYPE_BOOL = "BOOL"
+_TYPE_ENUM = "ENUM"
+_TYPE_FLOAT = "FLOAT"
+_TYPE_INTEGER = "INTEGER"
+_TYPE_STRING = "STRING"
+_OPERATION_EVENT = 4
+
+PARAM_CONFIG_PENDING = "CONFIG_PENDING"
+# Parameters, that don't prove a device alive or aren't reported cyclically.
+_LIVENESS_IGNORED_PARAMETERS = ("UNREACH", "STICKY_UNREACH")
+_LIVENESS_IGNORED_PREFIX = "PRESS_"
+
+STARTUP_STATE_STARTING = "starting"
+STARTUP_STATE_READY = "ready"
+STARTUP_STATE_FAILED = "failed"
+# Delay before a failed start is retried by reloading the config entry.
+STARTUP_RETRY_DELAY = 60
 
 
 class ControlUnit:
@@ -77,36 +178,210 @@ class ControlUnit:
         self.enable_sensors_for_system_variables = (
             control_config.enable_sensors_for_system_variables
         )
+        self._options = control_config.options
+        self._entity_filter = EntityFilter.from_options(self._options)
+        self._disabled_hm_entities: dict[str, BaseEntity] = {}
+        self._device_triggers: dict[str, tuple[str, list[dict[str, Any]]]] = {}
+        self._remove_registry_listener: CALLBACK_TYPE | None = None
+        self._remove_device_registry_listener: CALLBACK_TYPE | None = None
+        self._event_payloads: dict[
+            str, dict[tuple[Any, Any], MappingProxyType[str, Any]]
+        ] = {}
         self._central: CentralUnit = None
+        self._event_subscriptions: EventSubscriptions = None
         self._active_hm_entities: dict[str, BaseEntity] = {}
         self._hub = None
+        self._json_rpc: JsonRpcSession | None = None
+        self._metrics: dict[str, ControlUnitMetric] = {}
+        self._transports: dict[str, PooledTransport] = {}
+        self._compactors: dict[str, SetValueCompactor] = {}
+        self._round_trips = DeviceRoundTrips()
+        self._acks = AckRegistry(self._hass)
+        self._limiter = AdaptiveLimiter()
+        self._ack_subscriptions: dict[tuple[str, str], CALLBACK_TYPE] = {}
+        self._device_versions: dict[str, dict[str, tuple[Any, Any]]] = {}
+        self._reconnect_durations: dict[str, float] = {}
+        self._inbound_lanes = InboundLanes(self._hass)
+        self._master_paramsets = MasterParamsetCache(self._fetch_master_paramset)
+        self._config_pending_subscriptions: dict[str, CALLBACK_TYPE] = {}
+        self._liveness = DeviceLiveness()
+        self._liveness_subscriptions: dict[str, list[CALLBACK_TYPE]] = {}
+        self._remove_liveness_tick: CALLBACK_TYPE | None = None
+        self._poll_filter = PollFilter.from_options(self._options)
+        self._poll_scheduler = PollScheduler(
+            fetch=self._fetch_values_paramset,
+            publish=self._publish_polled_values,
+            interval=self._options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+            budget=self._options.get(CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET),
+        )
+        self._start_task: asyncio.Task | None = None
+        self._cancel_start_retry: CALLBACK_TYPE | None = None
+        self._ready = asyncio.Event()
+        self._startup_state = STARTUP_STATE_STARTING
+        self._startup_phase: str | None = None
+        self._startup_duration: float | None = None
+
+    @callback
+    def async_start_in_background(
+        self, before_start: Awaitable[Any] | None = None
+    ) -> None:
+        """
+        Start the control unit without blocking the setup of the config entry.
+        Entities are added as their devices are created, and EVENT_READY is
+        fired, when the control unit is started.
+        """
+        self.register_metric(
+            ControlUnitMetric(
+                key="startup",
+                name="Startup",
+                value_fn=lambda: self._startup_state,
+                attributes_fn=lambda: {
+                    "phase": self._startup_phase,
+                    "duration": self._startup_duration,
+                },
+            )
+        )
+        self._start_task = self._hass.async_create_task(
+            self._async_start_in_background(before_start)
+        )
+
+    async def _async_start_in_background(
+        self, before_start: Awaitable[Any] | None
+    ) -> None:
+        """Start the control unit and signal readiness."""
+        started = time.monotonic()
+        try:
+            if before_start is not None:
+                await before_start
+            await self.start()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            self._startup_state = STARTUP_STATE_FAILED
+            _LOGGER.error(
+                "Starting HAHM ControlUnit %s failed in phase %s: %s. Retrying in %is",
+                self._data[ATTR_INSTANCE_NAME],
+                self._startup_phase,
+                err,
+                STARTUP_RETRY_DELAY,
+            )
+            self._cancel_start_retry = async_call_later(
+                self._hass, STARTUP_RETRY_DELAY, self._async_retry_start
+            )
+            return
+        self._startup_duration = round(time.monotonic() - started, 3)
+        self._startup_state = STARTUP_STATE_READY
+        self._ready.set()
+        _LOGGER.info(
+            "HAHM ControlUnit %s ready after %.2fs",
+            self._data[ATTR_INSTANCE_NAME],
+            self._startup_duration,
+        )
+        self._hass.bus.async_fire(
+            EVENT_READY,
+            {
+                ATTR_INSTANCE_NAME: self._data[ATTR_INSTANCE_NAME],
+                "entry_id": self._entry_id,
+            },
+        )
+
+    @callback
+    def _async_retry_start(self, now: Any = None) -> None:
+        """Set the config entry up again after a failed start."""
+        self._cancel_start_retry = None
+        self._hass.async_create_task(
+            self._hass.config_entries.async_reload(self._entry_id)
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        """Return if the control unit is started."""
+        return self._ready.is_set()
+
+    async def async_wait_ready(self) -> None:
+        """Wait until the control unit is started."""
+        await self._ready.wait()
 
     async def start(self) -> None:
         """Start the control unit."""
         _LOGGER.debug("Starting HAHM ControlUnit %s", self._data[ATTR_INSTANCE_NAME])
         config.CACHE_DIR = "cache"
 
+        self._startup_phase = "central"
         self.create_central()
+        self._remove_registry_listener = self._hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated
+        )
+        self._remove_device_registry_listener = self._hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+        )
+        self._startup_phase = "clients"
         await self.create_clients()
+        self._startup_phase = "hub"
         await self.init_hub()
+        self._startup_phase = "devices"
         self._central.create_devices()
+        self._track_liveness(self._central.hm_devices)
+        self._startup_phase = "interfaces"
         await self.init_clients()
-        self._central.start_connection_checker()
+        self.start_connection_checker()
+        self._register_inbound_metrics()
+        self._start_liveness_tracking()
+        self._start_polling()
+        self._startup_phase = None
 
     async def stop(self) -> None:
         """Stop the control unit."""
         _LOGGER.debug("Stopping HAHM ControlUnit %s", self._data[ATTR_INSTANCE_NAME])
-        await self._central.stop_connection_checker()
+        if self._cancel_start_retry:
+            self._cancel_start_retry()
+            self._cancel_start_retry = None
+        if self._start_task and not self._start_task.done():
+            self._start_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._start_task
+        for unsubscribe in self._config_pending_subscriptions.values():
+            unsubscribe()
+        self._config_pending_subscriptions.clear()
+        for unsubscribe in self._ack_subscriptions.values():
+            unsubscribe()
+        self._ack_subscriptions.clear()
+        self._untrack_liveness(list(self._liveness_subscriptions))
+        await self._poll_scheduler.stop()
+        if self._remove_liveness_tick:
+            self._remove_liveness_tick()
+            self._remove_liveness_tick = None
+        if self._remove_registry_listener:
+            self._remove_registry_listener()
+            self._remove_registry_listener = None
+        if self._remove_device_registry_listener:
+            self._remove_device_registry_listener()
+            self._remove_device_registry_listener = None
+        if self._central is None:
+            return
+        self.stop_connection_checker()
         for client in self._central.clients.values():
             await client.proxy_de_init()
         await self._central.stop()
+        for compactor in self._compactors.values():
+            compactor.cancel()
+        for transport in self._transports.values():
+            transport.close()
+        if self._json_rpc:
+            await self._json_rpc.logout()
 
     async def init_hub(self) -> None:
         """Init the hub."""
         await self._central.init_hub()
         self._hub = HaHub(self._hass, self)
         await self._hub.init()
-        hm_entities = [self._central.hub.hub_entities.values()]
+        hm_entities = [
+            [
+                hm_entity
+                for name, hm_entity in self._central.hub.hub_entities.items()
+                if self._entity_filter.is_system_variable_allowed(name)
+            ]
+        ]
         args = [hm_entities]
 
         async_dispatcher_send(
@@ -115,6 +390,16 @@ class ControlUnit:
             *args,  # Don't send device if None, it would override default value in listeners
         )
 
+    @property
+    def instance_name(self) -> str:
+        """Return the name of the CCU instance."""
+        return self._data[ATTR_INSTANCE_NAME]
+
+    @property
+    def options(self) -> MappingProxyType[str, Any]:
+        """Return the options of the config entry."""
+        return self._options
+
     @property
     def hub(self) -> HaHub:
         """Return the Hub."""
@@ -125,11 +410,172 @@ class ControlUnit:
         for client in self._central.clients.values():
             await client.proxy_init()
 
+    def start_connection_checker(self) -> None:
+        """
+        Start checking the connections of the clients.
+        Replaces the connection checker of the central, that reinitializes
+        everything after a reconnect.
+        """
+        scheduler = get_reconnect_scheduler(self._hass)
+        for interface_id, client in self._central.clients.items():
+            scheduler.add_interface(
+                interface_id,
+                check=partial(self._check_client, client),
+                reconnect=partial(self.reconnect_client, client),
+            )
+            self.register_metric(
+                ControlUnitMetric(
+                    key=f"{interface_id}_connection",
+                    name=f"{interface_id} connection",
+                    value_fn=partial(scheduler.get_state, interface_id),
+                    attributes_fn=partial(scheduler.get_attributes, interface_id),
+                )
+            )
+
+    def stop_connection_checker(self) -> None:
+        """Stop checking the connections of the clients."""
+        scheduler = get_reconnect_scheduler(self._hass)
+        for interface_id in self._central.clients:
+            scheduler.remove_interface(interface_id)
+
+    async def _check_client(self, client: Client) -> bool:
+        """Return if the client is connected."""
+        if not await client.is_connected():
+            return False
+        if client.interface_id not in self._device_versions:
+            versions, _ = await self._scan_devices(client)
+            self._device_versions[client.interface_id] = versions
+        return True
+
+    async def reconnect_client(self, client: Client) -> None:
+        """
+        Bring a reconnected client back to a consistent state.
+        Only devices that were added, removed or changed on the CCU and
+        unreachable entities are touched.
+        """
+        interface_id = client.interface_id
+        start = time.monotonic()
+        await client.proxy_init()
+
+        known = {
+            address
+            for address, hm_device in self._central.hm_devices.items()
+            if hm_device.interface_id == interface_id
+        }
+
+        def _is_new(description: dict[str, Any]) -> bool:
+            return description[HM_ADDRESS].split(":")[0] not in known
+
+        # Only the descriptions of new devices are kept.
+        remote_versions, new_descriptions = await self._scan_devices(
+            client, keep=_is_new
+        )
+        old_versions = self._device_versions.get(interface_id, {})
+        added = remote_versions.keys() - known
+        removed = known - remote_versions.keys()
+        changed = {
+            address
+            for address, version in remote_versions.items()
+            if address in old_versions and old_versions[address] != version
+        }
+        self._device_versions[interface_id] = remote_versions
+
+        if removed:
+            # Delete the devices like a deleteDevices call of the CCU, so they
+            # are not reported as removed again by the next reconnect.
+            await self._central.delete_devices(interface_id, list(removed))
+            self._callback_system_event(
+                HH_EVENT_DELETE_DEVICES, interface_id, list(removed)
+            )
+        if added:
+            await self._central.add_new_devices(interface_id, new_descriptions)
+
+        refresh = [
+            entity
+            for entity in self._active_hm_entities.values()
+            if hasattr(entity, "load_data")
+            and (not entity.available or entity.address.split(":")[0] in changed)
+        ]
+        if refresh:
+            results = await asyncio.gather(
+                *(entity.load_data() for entity in refresh), return_exceptions=True
+            )
+            for entity, result in zip(refresh, results):
+                if isinstance(result, Exception):
+                    _LOGGER.warning(
+                        "Refreshing %s failed: %s", entity.unique_id, result
+                    )
+
+        duration = time.monotonic() - start
+        self._reconnect_durations[interface_id] = round(duration, 3)
+        self.register_metric(
+            ControlUnitMetric(
+                key=f"{interface_id}_reconnect_duration",
+                name=f"{interface_id} reconnect duration",
+                value_fn=lambda: self._reconnect_durations.get(interface_id),
+                unit=TIME_SECONDS,
+            )
+        )
+        _LOGGER.info(
+            "Reconnected %s in %.2fs (%i added, %i removed, %i refreshed)",
+            interface_id,
+            duration,
+            len(added),
+            len(removed),
+            len(refresh),
+        )
+
+    def _get_proxy(self, client: Client) -> xmlrpc.client.ServerProxy:
+        """Return the XML-RPC proxy of a client for calls not wrapped by hahomematic."""
+        if (proxy := get_server_proxy(client)) is None:
+            raise HomeAssistantError(
+                f"No XML-RPC proxy found for {client.interface_id}"
+            )
+        return proxy
+
+    async def _scan_devices(
+        self,
+        client: Client,
+        keep: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> tuple[dict[str, tuple[Any, Any]], list[dict[str, Any]]]:
+        """
+        Return the versions of the devices of an interface, and the device
+        and channel descriptions accepted by keep.
+        With the pooled transport, listDevices is parsed incrementally, so
+        the other descriptions are released as soon as they are read.
+        """
+        versions: dict[str, tuple[Any, Any]] = {}
+        kept: list[dict[str, Any]] = []
+
+        def _on_description(description: dict[str, Any]) -> None:
+            if not description.get(HM_PARENT):
+                versions[description[HM_ADDRESS]] = (
+                    description.get(HM_VERSION),
+                    description.get(HM_FIRMWARE),
+                )
+            if keep is not None and keep(description):
+                kept.append(description)
+
+        proxy = self._get_proxy(client)
+        if client.interface_id in self._transports:
+            await self._hass.async_add_executor_job(
+                stream_call, proxy, "listDevices", (), _on_description
+            )
+        else:
+            for description in await proxy.listDevices():
+                _on_description(description)
+        return versions, kept
+
     @property
     def central(self) -> CentralUnit:
         """return the HAHM central_unit instance."""
         return self._central
 
+    @property
+    def json_rpc(self) -> JsonRpcSession:
+        """Return the persistent JSON-RPC session to the CCU."""
+        return self._json_rpc
+
     def get_new_hm_entities(self, new_entities) -> dict[HmPlatform, list[BaseEntity]]:
         """
         Return all hm-entities by requested unique_ids
@@ -144,6 +590,8 @@ class ControlUnit:
                 entity.unique_id not in self._active_hm_entities
                 and entity.create_in_ha
                 and entity.platform.value in HAHM_PLATFORMS
+                and self._is_allowed(entity)
+                and not self._park_if_disabled(entity)
             ):
                 hm_entities[entity.platform].append(entity)
 
@@ -153,17 +601,405 @@ class ControlUnit:
         """
         Return all hm-entities by platform
         """
-        hm_entities = []
+        hm_entities: list[BaseEntity] = []
+        if self._central is None:
+            # Not started yet. The entities are added when they are created.
+            return hm_entities
         for entity in self._central.hm_entities.values():
             if (
                 entity.unique_id not in self._active_hm_entities
                 and entity.create_in_ha
                 and entity.platform == platform
+                and self._is_allowed(entity)
+                and not self._park_if_disabled(entity)
             ):
                 hm_entities.append(entity)
 
         return hm_entities
 
+    def _is_allowed(self, hm_entity: BaseEntity) -> bool:
+        """Return if the entity filter allows to create the hm-entity in HA."""
+        client = self._central.clients.get(hm_entity.interface_id)
+        return self._entity_filter.is_allowed(
+            hm_entity, interface_name=client.name if client else ""
+        )
+
+    def _park_if_disabled(self, hm_entity: BaseEntity) -> bool:
+        """
+        Keep hm-entities, that are disabled in the entity registry, without HA
+        entity. They are materialized, when they get enabled.
+        """
+        entity_registry = er.async_get(self._hass)
+        if (
+            entity_id := entity_registry.async_get_entity_id(
+                hm_entity.platform.value, DOMAIN, hm_entity.unique_id
+            )
+        ) is None:
+            # Unknown entities must be added once to create the registry entry.
+            return False
+        if (entry := entity_registry.async_get(entity_id)) and entry.disabled:
+            self._disabled_hm_entities[hm_entity.unique_id] = hm_entity
+            return True
+        return False
+
+    def park_hm_entity(self, hm_entity: BaseEntity) -> None:
+        """Keep a hm-entity, whose HA entity has been disabled."""
+        self._active_hm_entities.pop(hm_entity.unique_id, None)
+        self._disabled_hm_entities[hm_entity.unique_id] = hm_entity
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Build or drop the event payloads of a device created or removed in HA."""
+        if event.data["action"] == "create":
+            device_registry = dr.async_get(self._hass)
+            if (device := device_registry.async_get(event.data["device_id"])) and (
+                address := _get_device_address(device)
+            ):
+                self._build_event_payloads([address])
+        elif event.data["action"] == "remove":
+            device_id = event.data["device_id"]
+            for address, payloads in list(self._event_payloads.items()):
+                if any(
+                    payload.get(CONF_DEVICE_ID) == device_id
+                    for payload in payloads.values()
+                ):
+                    del self._event_payloads[address]
+
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        """Materialize disabled hm-entities, when they get enabled."""
+        if (
+            event.data["action"] != "update"
+            or "disabled_by" not in event.data.get("changes", {})
+            or not self._disabled_hm_entities
+        ):
+            return
+        entry = er.async_get(self._hass).async_get(event.data["entity_id"])
+        if entry is None or entry.platform != DOMAIN or entry.disabled:
+            return
+        if hm_entity := self._disabled_hm_entities.pop(entry.unique_id, None):
+            async_dispatcher_send(
+                self._hass,
+                self.async_signal_new_hm_entity(self._entry_id, hm_entity.platform),
+                [[hm_entity]],
+            )
+
+    @property
+    def metrics(self) -> list[ControlUnitMetric]:
+        """Return the registered metrics."""
+        return list(self._metrics.values())
+
+    @property
+    def master_paramsets(self) -> MasterParamsetCache:
+        """Return the cache of the MASTER paramsets."""
+        return self._master_paramsets
+
+    def get_paramset_description(
+        self, interface_id: str, address: str, paramset_key: str
+    ) -> dict[str, Any]:
+        """Return the cached paramset description of a channel."""
+        return (
+            self._central.paramsets.get_by_interface_address_paramset(
+                interface_id, address, paramset_key
+            )
+            or {}
+        )
+
+    async def _fetch_master_paramset(
+        self, interface_id: str, address: str
+    ) -> dict[str, Any]:
+        """Read the MASTER paramset of a channel from the CCU."""
+        proxy = self._get_proxy(self._central.clients[interface_id])
+        paramset = await proxy.getParamset(address, PARAMSET_KEY_MASTER)
+        self._subscribe_config_pending(address.split(":")[0])
+        return paramset
+
+    def _subscribe_config_pending(self, device_address: str) -> None:
+        """Invalidate the MASTER paramsets of a device, when it applied a config."""
+        if device_address in self._config_pending_subscriptions:
+            return
+
+        def _config_pending(interface_id, address, parameter, value) -> None:
+            # The configuration is applied, when CONFIG_PENDING returns to False.
+            if value:
+                return
+            self._hass.loop.call_soon_threadsafe(
+                self.async_invalidate_master_paramsets, address
+            )
+
+        self._config_pending_subscriptions[device_address] = self.subscribe_event(
+            f"{device_address}:0", PARAM_CONFIG_PENDING, _config_pending
+        )
+
+    @callback
+    def async_invalidate_master_paramsets(self, address: str) -> None:
+        """Drop the cached MASTER paramsets of a device and notify its entities."""
+        self._master_paramsets.invalidate(address)
+        async_dispatcher_send(
+            self._hass,
+            self.async_signal_master_paramset_updated(),
+            address.split(":")[0],
+        )
+
+    @property
+    def acks(self) -> AckRegistry:
+        """Return the registry of commands waiting for acknowledgement."""
+        return self._acks
+
+    @property
+    def rpc_deadlines(self) -> dict[str, float]:
+        """Return the deadlines of the outbound calls per operation."""
+        return {
+            OPERATION_READ: self._options.get(
+                CONF_RPC_READ_TIMEOUT, DEFAULT_DEADLINES[OPERATION_READ]
+            ),
+            OPERATION_WRITE: self._options.get(
+                CONF_RPC_WRITE_TIMEOUT, DEFAULT_DEADLINES[OPERATION_WRITE]
+            ),
+            OPERATION_PARAMSET_WRITE: self._options.get(
+                CONF_RPC_PARAMSET_WRITE_TIMEOUT,
+                DEFAULT_DEADLINES[OPERATION_PARAMSET_WRITE],
+            ),
+        }
+
+    @property
+    def ack_timeout(self) -> float:
+        """Return the time entity commands wait for acknowledgement, 0 if off."""
+        return self._options.get(CONF_WAIT_FOR_ACK, 0)
+
+    @callback
+    def expect_event(
+        self,
+        address: str,
+        parameter: str,
+        match: Callable[[Any], bool] | None = None,
+    ) -> tuple[Any, asyncio.Future]:
+        """Register a future for the next event of a parameter."""
+        key = (address, parameter)
+        if key not in self._ack_subscriptions:
+            self._ack_subscriptions[key] = self.subscribe_event(
+                address, parameter, self._event_acknowledged
+            )
+        return self._acks.expect(key, match)
+
+    def get_event_parameters(
+        self,
+        interface_id: str,
+        address: str,
+        paramset_key: str,
+        parameters: Iterable[str],
+    ) -> list[str]:
+        """
+        Return the parameters, whose values are reported by events.
+        Parameters without a cached description are assumed to be reported.
+        """
+        description = self.get_paramset_description(
+            interface_id, address, paramset_key
+        )
+        return [
+            parameter
+            for parameter in parameters
+            if (operations := description.get(parameter, {}).get(_PARAM_OPERATIONS))
+            is None
+            or operations & _OPERATION_EVENT
+        ]
+
+    def _event_acknowledged(
+        self, interface_id: str, address: str, parameter: str, value: Any
+    ) -> None:
+        """Resolve the commands waiting for an event."""
+        self._acks.resolve((address, parameter), value)
+
+    def subscribe_event(
+        self,
+        address: str,
+        parameter: str,
+        event_callback: Callable[[str, str, str, Any], None],
+    ) -> CALLBACK_TYPE:
+        """
+        Subscribe to the inbound events of a parameter.
+        The callback is called from the thread of the XML-RPC server.
+        """
+        return self._event_subscriptions.subscribe(address, parameter, event_callback)
+
+    @property
+    def inbound_lanes(self) -> InboundLanes:
+        """Return the priority lanes for inbound state updates."""
+        return self._inbound_lanes
+
+    def _register_inbound_metrics(self) -> None:
+        """Expose the latency of the inbound lanes as metrics."""
+        for lane in LANES:
+            lane_metrics = self._inbound_lanes.metrics[lane]
+            self.register_metric(
+                ControlUnitMetric(
+                    key=f"inbound_{lane}_latency",
+                    name=f"Inbound {lane} latency",
+                    value_fn=lambda lane_metrics=lane_metrics: lane_metrics.avg_latency,
+                    attributes_fn=lambda lane=lane, lane_metrics=lane_metrics: {
+                        **lane_metrics.as_dict(),
+                        "queue_depth": self._inbound_lanes.get_queue_depth(lane),
+                    },
+                    unit=TIME_MILLISECONDS,
+                )
+            )
+
+    def _start_liveness_tracking(self) -> None:
+        """Check the tracked devices for missed cyclic reports."""
+        self._remove_liveness_tick = async_track_time_interval(
+            self._hass, self._async_liveness_tick, timedelta(seconds=TICK_INTERVAL)
+        )
+        self.register_metric(
+            ControlUnitMetric(
+                key="stale_devices",
+                name="Stale devices",
+                value_fn=lambda: self._liveness.stale_devices,
+                attributes_fn=self._liveness.as_dict,
+            )
+        )
+
+    def _track_liveness(self, addresses: Iterable[str]) -> None:
+        """Feed the inbound events of devices into the liveness tracker."""
+        devices: dict[str, str] = {}
+        for address in addresses:
+            device_address = address.split(":")[0]
+            if (
+                device_address in self._liveness_subscriptions
+                or device_address.endswith(tuple(HM_VIRTUAL_REMOTES))
+                or (hm_device := self._central.hm_devices.get(device_address))
+                is None
+            ):
+                continue
+            devices[device_address] = hm_device.device_type
+        if not devices:
+            return
+        for device_address in devices:
+            self._liveness_subscriptions[device_address] = []
+        for address, parameter in self._event_subscriptions.get_subscribed():
+            device_address = address.split(":")[0]
+            if (
+                device_address not in devices
+                or parameter in _LIVENESS_IGNORED_PARAMETERS
+                or parameter.startswith(_LIVENESS_IGNORED_PREFIX)
+            ):
+                continue
+            self._liveness_subscriptions[device_address].append(
+                self.subscribe_event(address, parameter, self._device_seen)
+            )
+        for device_address, device_type in devices.items():
+            self._liveness.track(device_address, device_type)
+
+    def _untrack_liveness(self, addresses: Iterable[str]) -> None:
+        """Stop tracking the liveness of devices."""
+        for address in addresses:
+            device_address = address.split(":")[0]
+            for unsubscribe in self._liveness_subscriptions.pop(device_address, []):
+                unsubscribe()
+            self._liveness.untrack(device_address)
+
+    def _device_seen(
+        self, interface_id: str, address: str, parameter: str, value: Any
+    ) -> None:
+        """Record an inbound event of a device. Runs in the XML-RPC thread."""
+        device_address = address.split(":")[0]
+        if self._liveness.seen(device_address):
+            _LOGGER.info("%s reports again", device_address)
+            self._hass.add_job(self._async_device_liveness_changed, device_address)
+
+    @callback
+    def _async_liveness_tick(self, now: Any = None) -> None:
+        """Mark the devices stale, that missed their cyclic reports."""
+        for device_address in self._liveness.expire():
+            self._async_device_liveness_changed(device_address)
+
+    @callback
+    def _async_device_liveness_changed(self, device_address: str) -> None:
+        """Update the availability of the entities of a device."""
+        async_dispatcher_send(
+            self._hass, self.async_signal_device_liveness(), device_address
+        )
+
+    def is_device_stale(self, device_address: str) -> bool:
+        """Return if a device missed its cyclic reports."""
+        return self._liveness.is_stale(device_address)
+
+    def _start_polling(self) -> None:
+        """Poll the parameters, that are not pushed by the CCU."""
+        self._track_polling(self._central.hm_entities.values())
+        self._poll_scheduler.start()
+        self.register_metric(
+            ControlUnitMetric(
+                key="polled_devices",
+                name="Polled devices",
+                value_fn=lambda: self._poll_scheduler.devices,
+                attributes_fn=self._poll_scheduler.as_dict,
+            )
+        )
+
+    @callback
+    def _track_polling(self, hm_entities: Iterable[BaseEntity]) -> None:
+        """Add the poll-only parameters of hm-entities to the poll scheduler."""
+        for hm_entity in hm_entities:
+            client = self._central.clients.get(hm_entity.interface_id)
+            hm_device = self._central.hm_devices.get(hm_entity.address.split(":")[0])
+            if self._poll_filter.is_poll_only(
+                hm_entity,
+                interface_name=client.name if client else "",
+                device_type=hm_device.device_type if hm_device else "",
+            ):
+                self._poll_scheduler.add(
+                    hm_entity.interface_id, hm_entity.address, hm_entity.parameter
+                )
+
+    @callback
+    def _untrack_polling(self, addresses: Iterable[str]) -> None:
+        """Stop polling devices."""
+        for address in addresses:
+            self._poll_scheduler.remove_device(address)
+
+    async def _fetch_values_paramset(
+        self, interface_id: str, address: str
+    ) -> dict[str, Any]:
+        """Read the VALUES paramset of a channel from the CCU."""
+        proxy = self._get_proxy(self._central.clients[interface_id])
+        return await proxy.getParamset(address, PARAMSET_KEY_VALUES)
+
+    def _publish_polled_values(
+        self, interface_id: str, address: str, values: dict[str, Any]
+    ) -> None:
+        """Hand polled values to the hm-entities like pushed events."""
+        for parameter, value in values.items():
+            self._event_subscriptions.publish(interface_id, address, parameter, value)
+
+    def record_round_trip(self, hm_entity: BaseEntity, latency: float) -> None:
+        """Record the time until a sent value was confirmed by the device."""
+        device_address = hm_entity.address.split(":")[0]
+        self._round_trips.record(
+            device_address,
+            hm_entity.device_info.get("name") or device_address,
+            latency,
+        )
+        self.register_metric(
+            ControlUnitMetric(
+                key="command_round_trip",
+                name="Command round trip",
+                value_fn=lambda: self._round_trips.total.last_ms,
+                attributes_fn=self._round_trips.as_dict,
+                unit=TIME_MILLISECONDS,
+            )
+        )
+
+    def register_metric(self, metric: ControlUnitMetric) -> None:
+        """Register a metric and announce it to the sensor platform."""
+        if metric.key in self._metrics:
+            return
+        self._metrics[metric.key] = metric
+        async_dispatcher_send(
+            self._hass,
+            self.async_signal_new_hm_entity(self._entry_id, "metric"),
+            [[metric]],
+        )
+
     def add_hm_entity(self, hm_entity) -> None:
         """add entity to active entities"""
         self._active_hm_entities[hm_entity.unique_id] = hm_entity
@@ -178,11 +1014,28 @@ class ControlUnit:
         """Gateway specific event to signal new device."""
         return f"hahm-new-entity-{entry_id}-{device_type}"
 
+    @callback
+    def async_signal_device_liveness(self) -> str:
+        """Gateway specific event to signal a changed liveness of a device."""
+        return f"hahm-device-liveness-{self._entry_id}"
+
+    @callback
+    def async_signal_master_paramset_updated(self) -> str:
+        """Gateway specific event to signal changed MASTER paramsets of a device."""
+        return f"hahm-master-paramset-{self._entry_id}"
+
     @callback
     def _callback_system_event(self, src: str, *args):
         """Callback for ccu based events."""
         if src == HH_EVENT_DEVICES_CREATED:
             new_entity_unique_ids = args[1]
+            new_addresses = {
+                entity.address.split(":")[0] for entity in new_entity_unique_ids
+            }
+            self._invalidate_device_caches(new_addresses)
+            self._build_event_payloads(new_addresses)
+            self._track_liveness(new_addresses)
+            self._hass.add_job(self._track_polling, new_entity_unique_ids)
             # Handle event of new device creation in HAHM.
             for (platform, hm_entities) in self.get_new_hm_entities(
                 new_entity_unique_ids
@@ -200,47 +1053,132 @@ class ControlUnit:
             return
         elif src == HH_EVENT_DELETE_DEVICES:
             # Handle event of device removed in HAHM.
-            for address in args[1]:
-                if entity := self._get_active_entity_by_address(address):
+            self._invalidate_device_caches(args[1])
+            self._untrack_liveness(args[1])
+            self._hass.add_job(self._untrack_polling, args[1])
+            for device_address in {address.split(":")[0] for address in args[1]}:
+                for entity in self._get_active_entities_by_device_address(
+                    device_address
+                ):
                     entity.remove_entity()
             return
         elif src == HH_EVENT_ERROR:
             return
         elif src == HH_EVENT_LIST_DEVICES:
             return
-        elif src == HH_EVENT_RE_ADDED_DEVICE:
-            return
-        elif src == HH_EVENT_REPLACE_DEVICE:
-            return
-        elif src == HH_EVENT_UPDATE_DEVICE:
+        elif src in (
+            HH_EVENT_RE_ADDED_DEVICE,
+            HH_EVENT_REPLACE_DEVICE,
+            HH_EVENT_UPDATE_DEVICE,
+        ):
+            # args: interface_id, followed by address(es)
+            addresses: set[str] = set()
+            for arg in args[1:]:
+                if isinstance(arg, str):
+                    addresses.add(arg)
+                elif isinstance(arg, (list, tuple, set)):
+                    addresses.update(arg)
+            self._invalidate_device_caches(addresses)
+            self._build_event_payloads(
+                {address.split(":")[0] for address in addresses}
+            )
             return
 
+    def get_device_triggers(self, device: dr.DeviceEntry) -> list[dict[str, Any]]:
+        """Return the cached device triggers of a HA device."""
+        if (address := _get_device_address(device)) is None:
+            return []
+        if (cached := self._device_triggers.get(address)) and cached[0] == device.id:
+            return cached[1]
+        triggers: list[dict[str, Any]] = []
+        if hm_device := self._central.hm_devices.get(address):
+            for action_event in hm_device.action_events.values():
+                if isinstance(action_event, ImpulseEvent):
+                    continue
+
+                trigger = {
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: device.id,
+                    CONF_EVENT_TYPE: action_event.event_type.value,
+                }
+                trigger.update(action_event.get_event_data())
+                triggers.append(trigger)
+        self._device_triggers[address] = (device.id, triggers)
+        return triggers
+
+    def _invalidate_device_caches(self, addresses) -> None:
+        """Drop the cached triggers, event payloads and paramsets of devices."""
+        for address in addresses:
+            self._device_triggers.pop(address.split(":")[0], None)
+            self._event_payloads.pop(address.split(":")[0], None)
+            self._master_paramsets.invalidate(address)
+
     @callback
     def _callback_click_event(
         self, hm_event_type: HmEventType, event_data: dict[str, Any]
     ):
         """Fire event on click."""
-        if device_id := self._get_device_id(event_data[ATTR_ADDRESS]):
-            event_data[CONF_DEVICE_ID] = device_id
-
-        self._hass.bus.fire(
-            hm_event_type.value,
-            event_data,
+        self._hass.add_job(
+            self._async_fire_click_event,
+            hm_event_type,
+            self._get_event_payload(event_data),
         )
 
+    @callback
+    def _async_fire_click_event(
+        self, hm_event_type: HmEventType, event_data: dict[str, Any]
+    ) -> None:
+        """Run the device triggers of a click event and fire it on the bus."""
+        event = Event(hm_event_type.value, event_data)
+        get_trigger_router(self._hass).async_dispatch(event)
+        self._hass.bus.async_fire(event.event_type, event.data, context=event.context)
+
     @callback
     def _callback_alarm_event(
         self, hm_event_type: HmEventType, event_data: dict[str, Any]
     ):
         """Fire event on alarm."""
-        if device_id := self._get_device_id(event_data[ATTR_ADDRESS]):
-            event_data[CONF_DEVICE_ID] = device_id
-
         self._hass.bus.fire(
             hm_event_type.value,
-            event_data,
+            self._get_event_payload(event_data),
         )
 
+    def _build_event_payloads(self, addresses: Iterable[str]) -> None:
+        """
+        Build the event payloads of the action events of hm-devices.
+        Everything but the value is static per event source, so the payload
+        is built once per device, and only copied for further events.
+        Devices, that are not registered in HA yet, are built, when they
+        are created in the device registry.
+        """
+        for address in addresses:
+            if (hm_device := self._central.hm_devices.get(address)) is None:
+                continue
+            if (device_id := self._get_device_id(address)) is None:
+                continue
+            payloads: dict[tuple[Any, Any], MappingProxyType[str, Any]] = {}
+            for action_event in hm_device.action_events.values():
+                event_data = action_event.get_event_data()
+                event_data.pop(ATTR_VALUE, None)
+                event_data[CONF_DEVICE_ID] = device_id
+                payloads[_get_event_key(event_data)] = MappingProxyType(event_data)
+            self._event_payloads[address] = payloads
+
+    def _get_event_payload(self, event_data: dict[str, Any]) -> dict[str, Any]:
+        """Return the event data with the device id of the hm-device."""
+        payloads = self._event_payloads.get(event_data[ATTR_ADDRESS])
+        if payloads and (template := payloads.get(_get_event_key(event_data))):
+            payload = template.copy()
+            if ATTR_VALUE in event_data:
+                payload[ATTR_VALUE] = event_data[ATTR_VALUE]
+            return payload
+
+        payload = dict(event_data)
+        if device_id := self._get_device_id(event_data[ATTR_ADDRESS]):
+            payload[CONF_DEVICE_ID] = device_id
+        return payload
+
     def _get_device_id(self, address: str) -> str | None:
         """Return the device id of the hahm device."""
         hm_device = self.central.hm_devices.get(address)
@@ -256,6 +1194,17 @@ class ControlUnit:
             local_port=self._data.get(ATTR_CALLBACK_PORT),
         )
         client_session = aiohttp_client.async_get_clientsession(self._hass)
+        self._json_rpc = JsonRpcSession(
+            client_session=client_session,
+            host=self._data[ATTR_HOST],
+            username=self._data[ATTR_USERNAME],
+            password=self._data[ATTR_PASSWORD],
+            port=self._data[ATTR_JSON_PORT],
+            tls=self._data[ATTR_JSON_TLS],
+            verify_tls=self._data[ATTR_VERIFY_TLS],
+            limiter=self._limiter,
+            deadlines=self.rpc_deadlines,
+        )
         self._central = CentralConfig(
             name=self._data[ATTR_INSTANCE_NAME],
             entry_id=self._entry_id,
@@ -276,6 +1225,7 @@ class ControlUnit:
         self._central.callback_system_event = self._callback_system_event
         self._central.callback_click_event = self._callback_click_event
         self._central.callback_alarm_event = self._callback_alarm_event
+        self._event_subscriptions = EventSubscriptions(self._central)
 
     async def create_clients(self) -> set[Client]:
         """create clients for the central unit."""
@@ -296,12 +1246,182 @@ class ControlUnit:
                     else None,
                 ).get_client()
             )
+        for client in clients:
+            self._init_transport(client)
+            self._init_compaction(client)
+        self.register_metric(
+            ControlUnitMetric(
+                key="outbound_concurrency_limit",
+                name="Outbound concurrency limit",
+                value_fn=lambda: self._limiter.limit,
+                attributes_fn=self._limiter.as_dict,
+            )
+        )
         return clients
 
-    def _get_active_entity_by_address(self, address: str) -> BaseEntity:
-        for entity in self._active_hm_entities.values():
-            if entity.address == address:
-                return entity
+    def _init_transport(self, client: Client) -> None:
+        """Use a pooled keep-alive transport for the outbound calls of a client."""
+        if (proxy := get_server_proxy(client)) is None:
+            _LOGGER.debug(
+                "No XML-RPC proxy found for %s. Using default transport",
+                client.interface_id,
+            )
+            return
+        transport = install_pooled_transport(
+            proxy,
+            tls=self._data[ATTR_TLS],
+            verify_tls=self._data[ATTR_VERIFY_TLS],
+            pool_size=self._options.get(CONF_RPC_POOL_SIZE, DEFAULT_POOL_SIZE),
+            idle_timeout=self._options.get(
+                CONF_RPC_POOL_IDLE_TIMEOUT, DEFAULT_POOL_IDLE_TIMEOUT
+            ),
+            limiter=self._limiter,
+            deadlines=self.rpc_deadlines,
+        )
+        if transport is None:
+            _LOGGER.debug(
+                "Transport of %s can't be replaced. Using default transport",
+                client.interface_id,
+            )
+            return
+        self._transports[client.interface_id] = transport
+        self.register_metric(
+            ControlUnitMetric(
+                key=f"{client.interface_id}_rpc_connection_reuse",
+                name=f"{client.interface_id} RPC connection reuse",
+                value_fn=lambda: transport.metrics.reuse_rate,
+                attributes_fn=lambda: {
+                    **transport.metrics.as_dict(),
+                    "pool_size": transport.pool_size,
+                    "idle_connections": transport.idle_connections,
+                    "deadline_timeouts": transport.timeouts,
+                },
+                unit=PERCENTAGE,
+            )
+        )
+
+    def _init_compaction(self, client: Client) -> None:
+        """Merge concurrent values sent by set_value into putParamset calls."""
+        window = self._options.get(
+            CONF_RPC_COMPACTION_WINDOW, round(DEFAULT_COMPACTION_WINDOW * 1000)
+        )
+        if not window:
+            return
+        compactor = SetValueCompactor(
+            set_value=client.set_value,
+            put_paramset=client.put_paramset,
+            window=window / 1000,
+        )
+        self._compactors[client.interface_id] = compactor
+        self.register_metric(
+            ControlUnitMetric(
+                key=f"{client.interface_id}_set_value_compaction",
+                name=f"{client.interface_id} setValue compaction",
+                value_fn=lambda: compactor.saved_calls,
+                attributes_fn=compactor.as_dict,
+            )
+        )
+
+    def is_compacting(self, interface_id: str) -> bool:
+        """Return if the values sent by set_value to an interface are merged."""
+        return interface_id in self._compactors
+
+    async def set_value(
+        self,
+        interface_id: str,
+        address: str,
+        parameter: str,
+        value: Any,
+        rx_mode: str | None = None,
+    ) -> None:
+        """
+        Send a value to a channel.
+        Concurrent values of a channel are merged by the compactor of the
+        interface, if compaction is enabled.
+        """
+        if (compactor := self._compactors.get(interface_id)) is not None:
+            await compactor.set_value(address, parameter, value, rx_mode)
+            return
+        await self._central.clients[interface_id].set_value(
+            address, parameter, value, rx_mode
+        )
+
+    def get_active_hm_entity(self, unique_id: str) -> BaseEntity | None:
+        """Return the active hm-entity with the unique id."""
+        return self._active_hm_entities.get(unique_id)
+
+    def has_hm_device(self, address: str) -> bool:
+        """Return if the hm-device of an address belongs to this CCU."""
+        return address.split(":")[0] in self._central.hm_devices
+
+    async def press_virtual_key(self, address: str, parameter: str) -> None:
+        """Press a key of a virtual remote of this CCU."""
+        await self._central.press_virtual_remote_key(address, parameter)
+
+    async def send_group_value(
+        self, hm_entities: list[GenericEntity], value: Any
+    ) -> list[GenericEntity]:
+        """
+        Send a value to a group of hm-entities.
+        The value is converted to the type of the parameter of each hm-entity,
+        and the values are sent in parallel, limited per interface.
+        Return the hm-entities, whose value couldn't be sent.
+        """
+        by_interface: dict[str, list[GenericEntity]] = {}
+        for hm_entity in hm_entities:
+            by_interface.setdefault(hm_entity.interface_id, []).append(hm_entity)
+
+        async def _send(semaphore: asyncio.Semaphore, hm_entity: GenericEntity):
+            async with semaphore:
+                await self.set_value(
+                    hm_entity.interface_id,
+                    hm_entity.address,
+                    hm_entity.parameter,
+                    _convert_parameter_value(hm_entity, value),
+                )
+
+        targets: list[GenericEntity] = []
+        jobs = []
+        for interface_entities in by_interface.values():
+            semaphore = asyncio.Semaphore(GROUP_VALUE_CONCURRENCY)
+            for hm_entity in interface_entities:
+                targets.append(hm_entity)
+                jobs.append(_send(semaphore, hm_entity))
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        failed: list[GenericEntity] = []
+        for hm_entity, result in zip(targets, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning(
+                    "Sending value to %s failed: %s", hm_entity.unique_id, result
+                )
+                failed.append(hm_entity)
+        return failed
+
+    def _get_active_entities_by_device_address(
+        self, device_address: str
+    ) -> list[BaseEntity]:
+        """Return all active entities of a device and its channels."""
+        return [
+            entity
+            for entity in self._active_hm_entities.values()
+            if entity.address.split(":")[0] == device_address
+        ]
+
+
+def _get_event_key(event_data: Mapping[str, Any]) -> tuple[Any, Any]:
+    """Return the key of the event source within a hm-device."""
+    return event_data.get(ATTR_PARAMETER), event_data.get(ATTR_SUBTYPE)
+
+
+def _get_device_address(device: dr.DeviceEntry) -> str | None:
+    """Return the address of the hm-device of a HA device."""
+    for domain, address in device.identifiers:
+        if domain != DOMAIN:
+            continue
+        if address.endswith(tuple(HM_VIRTUAL_REMOTES)):
+            return address.split("_")[1]
+        return address
+    return None
 
 
 class ControlConfig:
@@ -314,18 +1434,48 @@ class ControlConfig:
         data: MappingProxyType[str, Any],
         enable_virtual_channels: bool = False,
         enable_sensors_for_system_variables: bool = False,
+        options: MappingProxyType[str, Any] | None = None,
     ) -> None:
         self.hass = hass
         self.entry_id = entry_id
         self.data = data
         self.enable_virtual_channels = enable_virtual_channels
         self.enable_sensors_for_system_variables = enable_sensors_for_system_variables
+        self.options = options or MappingProxyType({})
 
     def get_control_unit(self) -> ControlUnit:
         """Identify the used client."""
         return ControlUnit(self)
 
 
+class ControlUnitMetric:
+    """A runtime metric of the control unit, exposed as diagnostic sensor."""
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        value_fn: Callable[[], Any],
+        attributes_fn: Callable[[], dict[str, Any]] | None = None,
+        unit: str | None = None,
+    ) -> None:
+        self.key = key
+        self.name = name
+        self.unit = unit
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+
+    @property
+    def value(self) -> Any:
+        """Return the current value of the metric."""
+        return self._value_fn()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return additional values of the metric."""
+        return self._attributes_fn() if self._attributes_fn else {}
+
+
 class HaHub(Entity):
     """The HomeMatic hub. (CCU2/HomeGear)."""
 
@@ -336,6 +1486,9 @@ class HaHub(Entity):
         self._hm_hub: HmHub = self._cu.central.hub
         self._name = self._cu.central.instance_name
         self.entity_id = f"{DOMAIN}.{slugify(self._name.lower())}"
+        self._variables: dict[str, Any] = {}
+        self._variable_type_index: dict[str, type] | None = None
+        self._fetch_count = 0
         self._hm_hub.register_update_callback(self._update_hub)
 
     async def init(self) -> None:
@@ -362,7 +1515,38 @@ class HaHub(Entity):
 
     async def _fetch_data(self, now) -> None:
         """Fetch data from backend."""
-        await self._hm_hub.fetch_data()
+        self._fetch_count += 1
+        names = self._variable_names
+        if not names or self._fetch_count % FULL_FETCH_INTERVAL == 0:
+            self._variables.clear()
+            await self._hm_hub.fetch_data()
+            return
+        try:
+            variables = await self._cu.json_rpc.get_system_variables(names)
+        except JsonRpcError as err:
+            _LOGGER.warning(
+                "Reading system variables from %s failed: %s", self.name, err
+            )
+            return
+        self._update_variables(variables)
+
+    @property
+    def _variable_names(self) -> list[str]:
+        """Return the names of all known system variables."""
+        return list(self._hm_hub.hub_entities) + [
+            name
+            for name in self._hm_hub.extra_state_attributes
+            if name not in self._hm_hub.hub_entities
+        ]
+
+    def _update_variables(self, variables: dict[str, Any]) -> None:
+        """Update hub sensors and attributes with fetched variable values."""
+        for name, value in variables.items():
+            if sensor := self._hm_hub.hub_entities.get(name):
+                sensor.update_value(value)
+            else:
+                self._variables[name] = value
+        self.async_write_ha_state()
 
     @property
     def state(self):
@@ -370,9 +1554,13 @@ class HaHub(Entity):
         return self._hm_hub.state
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes."""
-        return self._hm_hub.extra_state_attributes
+        if not self._variables:
+            return get_shared_attributes(self._hm_hub.extra_state_attributes)
+        return get_shared_attributes(
+            {**self._hm_hub.extra_state_attributes, **self._variables}
+        )
 
     @property
     def icon(self) -> str:
@@ -381,21 +1569,83 @@ class HaHub(Entity):
 
     async def set_variable(self, name: str, value) -> None:
         """Set variable value on CCU/Homegear."""
-        sensor = self._hm_hub.hub_entities.get(name)
-        if not sensor or name in self.extra_state_attributes:
-            _LOGGER.error("Variable %s not found on %s", name, self.name)
-            return
+        await self.set_variables({name: value})
+
+    async def set_variables(self, values: dict[str, Any]) -> None:
+        """Set multiple variable values on CCU/Homegear with a single request."""
+        converted: dict[str, Any] = {}
+        for name, value in values.items():
+            if (value_type := self._variable_types.get(name)) is None:
+                raise HomeAssistantError(f"Variable {name} not found on {self.name}")
+            try:
+                converted[name] = _convert_variable_value(value_type, value)
+            except (ValueError, vol.Invalid) as err:
+                raise HomeAssistantError(
+                    f"Invalid value {value} for variable {name} on {self.name}"
+                ) from err
 
-        old_value = None
-        if sensor:
-            old_value = sensor.state
-        if old_value is None:
-            old_value = self.extra_state_attributes.get(name)
+        await self._cu.json_rpc.set_system_variables(converted)
+        # Don't wait for the next poll to show the new values.
+        self._update_variables(converted)
 
-        value = cv.boolean(value) if isinstance(old_value, bool) else float(value)
-        await self._hm_hub.set_system_variable(name, value)
+    @property
+    def _variable_types(self) -> dict[str, type]:
+        """Return the cached value types of all known system variables."""
+        if self._variable_type_index is None:
+            index: dict[str, type] = {}
+            for name, value in self._hm_hub.extra_state_attributes.items():
+                index[name] = _get_variable_type(value)
+            for name, sensor in self._hm_hub.hub_entities.items():
+                index[name] = _get_variable_type(sensor.state)
+            self._variable_type_index = index
+        return self._variable_type_index
 
     @callback
     def _update_hub(self, *args) -> None:
         """Update the HA hub."""
+        # A full fetch may have added or removed variables.
+        self._variable_type_index = None
+        get_unrecorded_hub_attributes(self.hass).update(
+            self._hm_hub.extra_state_attributes
+        )
         self.async_schedule_update_ha_state(True)
+
+
+def _get_variable_type(value: Any) -> type:
+    """Return the type used to convert new values of a system variable."""
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, str):
+        return str
+    return float
+
+
+def _convert_variable_value(value_type: type, value: Any) -> Any:
+    """Convert a value to the type of the system variable."""
+    if value_type is bool:
+        return cv.boolean(value)
+    if value_type is str:
+        return str(value)
+    return float(value)
+
+
+def _convert_parameter_value(hm_entity: GenericEntity, value: Any) -> Any:
+    """Convert a value to the type of the parameter of a hm-entity."""
+    # pylint: disable=protected-access
+    parameter_data = getattr(hm_entity, "_parameter_data", None) or {}
+    value_type = parameter_data.get(_PARAM_TYPE)
+    if value_type in (_TYPE_BOOL, _TYPE_ACTION):
+        return cv.boolean(value)
+    if value_type == _TYPE_FLOAT:
+        return float(value)
+    if value_type == _TYPE_INTEGER:
+        return int(value)
+    if value_type == _TYPE_ENUM:
+        if isinstance(value, str) and value in (
+            value_list := parameter_data.get(_PARAM_VALUE_LIST) or []
+        ):
+            return value_list.index(value)
+        return int(value)
+    if value_type == _TYPE_STRING:
+        return str(value)
+    return value
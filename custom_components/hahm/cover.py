@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 from abc import ABC
+from collections.abc import Awaitable, Callable
 import logging
+import time
+from typing import Any
 
 from hahomematic.const import HmPlatform
 from hahomematic.devices.cover import HmBlind, HmCover, HmGarage
@@ -20,9 +23,20 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .const import DOMAIN
 from .control_unit import ControlUnit
 from .generic_entity import HaHomematicGenericEntity
+from .motion import CoverMotion
+from .optimistic import OptimisticState
+from .paramset_cache import PARAMSET_KEY_MASTER
 
 _LOGGER = logging.getLogger(__name__)
 
+_PARAM_LEVEL = "LEVEL"
+_PARAM_LEVEL_2 = "LEVEL_2"
+# Positions are confirmed, when the cover reached them.
+_CONFIRM_TIMEOUT = 120
+# Travel times configured on the device, in seconds.
+_PARAM_RUNNING_TIME_BOTTOM_TOP = "REFERENCE_RUNNING_TIME_BOTTOM_TOP"
+_PARAM_RUNNING_TIME_TOP_BOTTOM = "REFERENCE_RUNNING_TIME_TOP_BOTTOM"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -40,7 +54,9 @@ async def async_setup_entry(
         for hm_entity in args[0]:
             if isinstance(hm_entity, HmBlind):
                 entities.append(HaHomematicBlind(control_unit, hm_entity))
-            elif isinstance(hm_entity, (HmCover, HmGarage)):
+            elif isinstance(hm_entity, HmGarage):
+                entities.append(HaHomematicGarage(control_unit, hm_entity))
+            elif isinstance(hm_entity, HmCover):
                 entities.append(HaHomematicCover(control_unit, hm_entity))
 
         if entities:
@@ -63,67 +79,192 @@ class HaHomematicCover(HaHomematicGenericEntity, CoverEntity):
     """Representation of the HomematicIP cover entity."""
 
     _hm_entity: HmCover | HmGarage
+    _optimistic: OptimisticState
+    # Covers with a LEVEL interpolate their position while moving.
+    _interpolate_position = True
+
+    def __init__(self, control_unit: ControlUnit, hm_entity) -> None:
+        """Initialize the cover entity."""
+        super().__init__(control_unit, hm_entity)
+        self._init_optimistic_state().track(
+            _PARAM_LEVEL, lambda: self._hm_entity.current_cover_position
+        )
+        self._motion = CoverMotion(
+            name=self._hm_entity.unique_id, write_state=self.async_write_ha_state
+        )
+        self._reported_level = self._hm_entity.current_cover_position
 
     @property
     def current_cover_position(self) -> int | None:
         """
         Return current position of cover.
         """
-        return self._hm_entity.current_cover_position
+        if (position := self._motion.position) is not None:
+            return round(position)
+        return self._optimistic.get(_PARAM_LEVEL)
+
+    @property
+    def is_opening(self) -> bool | None:
+        """Return if the cover is opening."""
+        return self._motion.is_opening
+
+    @property
+    def is_closing(self) -> bool | None:
+        """Return if the cover is closing."""
+        return self._motion.is_closing
 
     async def async_set_cover_position(self, **kwargs) -> None:
         """Move the cover to a specific position."""
         # Hm cover is closed:1 -> open:0
         if ATTR_POSITION in kwargs:
             position = float(kwargs[ATTR_POSITION])
-            await self._hm_entity.set_cover_position(position)
+            await self._async_move(
+                int(position), lambda: self._hm_entity.set_cover_position(position)
+            )
 
     @property
     def is_closed(self) -> bool | None:
         """Return if the cover is closed."""
+        if self._optimistic.is_pending(_PARAM_LEVEL):
+            return self._optimistic.get(_PARAM_LEVEL) == 0
         return self._hm_entity.is_closed
 
     async def async_open_cover(self, **kwargs) -> None:
         """Open the cover."""
-        await self._hm_entity.open_cover()
+        await self._async_move(100, self._hm_entity.open_cover)
 
     async def async_close_cover(self, **kwargs) -> None:
         """Close the cover."""
-        await self._hm_entity.close_cover()
+        await self._async_move(0, self._hm_entity.close_cover)
 
     async def async_stop_cover(self, **kwargs) -> None:
         """Stop the device if in motion."""
+        self._motion.stop()
+        self._optimistic.rollback(_PARAM_LEVEL)
         await self._hm_entity.stop_cover()
 
+    async def _async_move(
+        self, target: int, move: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Send a position and interpolate the movement towards it."""
+        position = self.current_cover_position
+        async with self._async_command(_PARAM_LEVEL, target, _CONFIRM_TIMEOUT):
+            # The cover already moves, while the command is acknowledged.
+            start_time = time.monotonic()
+            await move()
+            if self._interpolate_position:
+                self._motion.start(position, target, start_time)
+
+    @callback
+    def _async_device_changed(self, *args, **kwargs) -> None:
+        """Snap to the LEVEL reported by the device."""
+        level = self._hm_entity.current_cover_position
+        # Any update of a stopped cover replaces its held position.
+        if level != self._reported_level or self._motion.is_holding:
+            self._reported_level = level
+            self._motion.report(level)
+        super()._async_device_changed(*args, **kwargs)
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks and read the configured travel times."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._motion.cancel)
+        if not self._has_travel_times:
+            return
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._cu.async_signal_master_paramset_updated(),
+                self._async_master_paramset_updated,
+            )
+        )
+        await self._async_load_travel_times()
+
+    @property
+    def _channel_address(self) -> str:
+        """Return the address of the actuator channel."""
+        address = self._hm_entity.address
+        if ":" in address:
+            return address
+        return f"{address}:{getattr(self._hm_entity, 'channel_no', 1)}"
+
+    @property
+    def _has_travel_times(self) -> bool:
+        """Return if travel times can be configured on the device."""
+        if not self._interpolate_position:
+            return False
+        description = self._cu.get_paramset_description(
+            self._hm_entity.interface_id, self._channel_address, PARAMSET_KEY_MASTER
+        )
+        return (
+            _PARAM_RUNNING_TIME_BOTTOM_TOP in description
+            or _PARAM_RUNNING_TIME_TOP_BOTTOM in description
+        )
+
+    async def _async_load_travel_times(self) -> None:
+        """Read the travel times configured on the device through the cache."""
+        try:
+            paramset = await self._cu.master_paramsets.async_get(
+                self._hm_entity.interface_id, self._channel_address
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug(
+                "Reading MASTER paramset of %s failed: %s", self._channel_address, err
+            )
+            return
+        self._motion.configure(
+            opening=paramset.get(_PARAM_RUNNING_TIME_BOTTOM_TOP),
+            closing=paramset.get(_PARAM_RUNNING_TIME_TOP_BOTTOM),
+        )
+
+    @callback
+    def _async_master_paramset_updated(self, device_address: str) -> None:
+        """Reload the travel times, if the configuration of the device changed."""
+        if device_address == self._channel_address.split(":")[0]:
+            self.hass.async_create_task(self._async_load_travel_times())
+
 
 class HaHomematicBlind(HaHomematicCover, CoverEntity, ABC):
     """Representation of the HomematicIP blind entity."""
 
     _hm_entity: HmBlind
 
+    def __init__(self, control_unit: ControlUnit, hm_entity) -> None:
+        """Initialize the blind entity."""
+        super().__init__(control_unit, hm_entity)
+        self._optimistic.track(
+            _PARAM_LEVEL_2, lambda: self._hm_entity.current_cover_tilt_position
+        )
+
     @property
     def current_cover_tilt_position(self) -> int | None:
         """
         Return current tilt position of cover.
         """
-        return self._hm_entity.current_cover_tilt_position
+        return self._optimistic.get(_PARAM_LEVEL_2)
 
     async def async_set_cover_tilt_position(self, **kwargs) -> None:
         """Move the cover to a specific tilt position."""
         if ATTR_TILT_POSITION in kwargs:
             position = float(kwargs[ATTR_TILT_POSITION])
-            await self._hm_entity.set_cover_tilt_position(position)
+            async with self._async_command(
+                _PARAM_LEVEL_2, int(position), _CONFIRM_TIMEOUT
+            ):
+                await self._hm_entity.set_cover_tilt_position(position)
 
     async def async_open_cover_tilt(self, **kwargs) -> None:
         """Open the tilt."""
-        await self._hm_entity.open_cover_tilt()
+        async with self._async_command(_PARAM_LEVEL_2, 100, _CONFIRM_TIMEOUT):
+            await self._hm_entity.open_cover_tilt()
 
     async def async_close_cover_tilt(self, **kwargs) -> None:
         """Close the tilt."""
-        await self._hm_entity.close_cover_tilt()
+        async with self._async_command(_PARAM_LEVEL_2, 0, _CONFIRM_TIMEOUT):
+            await self._hm_entity.close_cover_tilt()
 
     async def async_stop_cover_tilt(self, **kwargs) -> None:
         """Stop the device if in motion."""
+        self._optimistic.rollback(_PARAM_LEVEL_2)
         await self._hm_entity.stop_cover_tilt()
 
 
@@ -131,3 +272,5 @@ class HaHomematicGarage(HaHomematicCover, CoverEntity):
     """Representation of the HomematicIP garage entity."""
 
     _hm_entity: HmGarage
+    # Garage doors have no LEVEL to learn a movement from.
+    _interpolate_position = False
@@ -3,8 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from hahomematic.const import CLICK_EVENTS, HM_VIRTUAL_REMOTES
-from hahomematic.entity import ImpulseEvent
+from hahomematic.const import CLICK_EVENTS
 import voluptuous as vol
 
 from homeassistant.components.automation import (
@@ -12,23 +11,14 @@ from homeassistant.components.automation import (
     AutomationTriggerInfo,
 )
 from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
-from homeassistant.components.homeassistant.triggers import event as event_trigger
-from homeassistant.const import (
-    CONF_ADDRESS,
-    CONF_DEVICE_ID,
-    CONF_DOMAIN,
-    CONF_PLATFORM,
-    CONF_TYPE,
-)
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.const import CONF_ADDRESS, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.typing import ConfigType
 
-from . import DOMAIN
+from .const import CONF_EVENT_TYPE, CONF_INTERFACE_ID, DOMAIN
 from .control_unit import ControlUnit
-
-CONF_INTERFACE_ID = "interface_id"
-CONF_EVENT_TYPE = "event_type"
+from .trigger_router import get_trigger_router
 
 TRIGGER_TYPES = CLICK_EVENTS
 
@@ -49,25 +39,11 @@ async def async_get_triggers(
     device_registry = dr.async_get(hass)
     if (device := device_registry.async_get(device_id)) is None:
         return None
-    address = list(device.identifiers)[0][1]
-    if address.endswith(tuple(HM_VIRTUAL_REMOTES)):
-        address = address.split("_")[1]
-    triggers = []
+    triggers: list[dict[str, Any]] = []
     for entry_id in device.config_entries:
-        control_unit: ControlUnit = hass.data[DOMAIN][entry_id]
-        if hm_device := control_unit.central.hm_devices.get(address):
-            for action_event in hm_device.action_events.values():
-                if isinstance(action_event, ImpulseEvent):
-                    continue
-
-                trigger = {
-                    CONF_PLATFORM: "device",
-                    CONF_DOMAIN: DOMAIN,
-                    CONF_DEVICE_ID: device_id,
-                    CONF_EVENT_TYPE: action_event.event_type.value,
-                }
-                trigger.update(action_event.get_event_data())
-                triggers.append(trigger)
+        control_unit: ControlUnit | None = hass.data[DOMAIN].get(entry_id)
+        if control_unit is not None and control_unit.central is not None:
+            triggers.extend(control_unit.get_device_triggers(device))
 
     return triggers
 
@@ -79,19 +55,9 @@ async def async_attach_trigger(
     automation_info: AutomationTriggerInfo,
 ) -> CALLBACK_TYPE:
     """Listen for state changes based on configuration."""
-    _event_data = {
-        CONF_INTERFACE_ID: config[CONF_INTERFACE_ID],
-        CONF_ADDRESS: config[CONF_ADDRESS],
-        CONF_TYPE: config[CONF_TYPE],
-    }
-
-    event_config = {
-        event_trigger.CONF_PLATFORM: "event",
-        event_trigger.CONF_EVENT_TYPE: config[CONF_EVENT_TYPE],
-        event_trigger.CONF_EVENT_DATA: _event_data,
-    }
-
-    event_config = event_trigger.TRIGGER_SCHEMA(event_config)
-    return await event_trigger.async_attach_trigger(
-        hass, event_config, action, automation_info, platform_type="device"
+    return get_trigger_router(hass).async_attach(
+        (config[CONF_INTERFACE_ID], config[CONF_ADDRESS], config[CONF_TYPE]),
+        config[CONF_EVENT_TYPE],
+        HassJob(action),
+        automation_info["trigger_data"],
     )
@@ -0,0 +1,128 @@
+"""Filter for the hm-entities, that should be created in HA."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from fnmatch import fnmatchcase
+from typing import Any
+
+from hahomematic.entity import BaseEntity
+
+from .const import (
+    CONF_FILTER_EXCLUDE_CHANNELS,
+    CONF_FILTER_EXCLUDE_DEVICE_TYPES,
+    CONF_FILTER_EXCLUDE_INTERFACES,
+    CONF_FILTER_EXCLUDE_PARAMETERS,
+    CONF_FILTER_EXCLUDE_SYSTEM_VARIABLES,
+    CONF_FILTER_INCLUDE_DEVICE_TYPES,
+    CONF_FILTER_INCLUDE_PARAMETERS,
+)
+
+
+class EntityFilter:
+    """
+    Allow/deny filter for hm-entities.
+    Include lists are only applied if not empty.
+    Patterns are case insensitive globs.
+    """
+
+    def __init__(
+        self,
+        include_device_types: Iterable[str] = (),
+        exclude_device_types: Iterable[str] = (),
+        include_parameters: Iterable[str] = (),
+        exclude_parameters: Iterable[str] = (),
+        exclude_channels: Iterable[int] = (),
+        exclude_interfaces: Iterable[str] = (),
+        exclude_system_variables: Iterable[str] = (),
+    ) -> None:
+        self._include_device_types = _normalize(include_device_types)
+        self._exclude_device_types = _normalize(exclude_device_types)
+        self._include_parameters = _normalize(include_parameters)
+        self._exclude_parameters = _normalize(exclude_parameters)
+        self._exclude_channels = frozenset(exclude_channels)
+        self._exclude_interfaces = _normalize(exclude_interfaces)
+        self._exclude_system_variables = _normalize(exclude_system_variables)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> EntityFilter:
+        """Create the filter from the config entry options."""
+        return cls(
+            include_device_types=split_option(
+                options.get(CONF_FILTER_INCLUDE_DEVICE_TYPES)
+            ),
+            exclude_device_types=split_option(
+                options.get(CONF_FILTER_EXCLUDE_DEVICE_TYPES)
+            ),
+            include_parameters=split_option(
+                options.get(CONF_FILTER_INCLUDE_PARAMETERS)
+            ),
+            exclude_parameters=split_option(
+                options.get(CONF_FILTER_EXCLUDE_PARAMETERS)
+            ),
+            exclude_channels=[
+                int(channel)
+                for channel in split_option(options.get(CONF_FILTER_EXCLUDE_CHANNELS))
+                if channel.isdigit()
+            ],
+            exclude_interfaces=split_option(
+                options.get(CONF_FILTER_EXCLUDE_INTERFACES)
+            ),
+            exclude_system_variables=split_option(
+                options.get(CONF_FILTER_EXCLUDE_SYSTEM_VARIABLES)
+            ),
+        )
+
+    def is_allowed(self, hm_entity: BaseEntity, interface_name: str) -> bool:
+        """Return if a hm-entity should be created in HA."""
+        if _matches((hm_entity.interface_id, interface_name), self._exclude_interfaces):
+            return False
+
+        device_type = hm_entity.device_type
+        if self._include_device_types and not _matches(
+            (device_type,), self._include_device_types
+        ):
+            return False
+        if _matches((device_type,), self._exclude_device_types):
+            return False
+
+        # Custom entities span multiple parameters.
+        if parameter := getattr(hm_entity, "parameter", None):
+            if self._include_parameters and not _matches(
+                (parameter,), self._include_parameters
+            ):
+                return False
+            if _matches((parameter,), self._exclude_parameters):
+                return False
+
+        if self._exclude_channels and ":" in hm_entity.address:
+            channel = hm_entity.address.split(":")[1]
+            if channel.isdigit() and int(channel) in self._exclude_channels:
+                return False
+
+        return True
+
+    def is_system_variable_allowed(self, name: str) -> bool:
+        """Return if a system variable should be created as hub sensor."""
+        return not _matches((name,), self._exclude_system_variables)
+
+
+def split_option(value: str | None) -> list[str]:
+    """Split a comma separated option value."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _normalize(patterns: Iterable[str]) -> tuple[str, ...]:
+    """Return the patterns in upper case."""
+    return tuple(pattern.upper() for pattern in patterns)
+
+
+def _matches(values: Iterable[str | None], patterns: tuple[str, ...]) -> bool:
+    """Return if any of the values matches any of the patterns."""
+    return any(
+        fnmatchcase(value.upper(), pattern)
+        for value in values
+        if value
+        for pattern in patterns
+    )
@@ -0,0 +1,52 @@
+"""Subscriptions to the parameter events of the central unit."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from hahomematic.central_unit import CentralUnit
+
+from homeassistant.core import CALLBACK_TYPE
+
+EventCallback = Callable[[str, str, str, Any], None]
+
+
+class EventSubscriptions:
+    """
+    Access to the event subscriptions of the central unit.
+    hahomematic calls the callbacks in entity_event_subscriptions for every
+    event of a parameter. The integration only uses that mapping through
+    this class, so its layout is known in one place.
+    The callbacks are called from the thread of the XML-RPC server.
+    """
+
+    def __init__(self, central: CentralUnit) -> None:
+        self._central = central
+
+    def subscribe(
+        self, address: str, parameter: str, event_callback: EventCallback
+    ) -> CALLBACK_TYPE:
+        """Subscribe to the events of a parameter."""
+        subscriptions = self._central.entity_event_subscriptions.setdefault(
+            (address, parameter), []
+        )
+        subscriptions.append(event_callback)
+
+        def _unsubscribe() -> None:
+            if event_callback in subscriptions:
+                subscriptions.remove(event_callback)
+
+        return _unsubscribe
+
+    def publish(
+        self, interface_id: str, address: str, parameter: str, value: Any
+    ) -> None:
+        """Call the callbacks of a parameter like for an inbound event."""
+        for event_callback in list(
+            self._central.entity_event_subscriptions.get((address, parameter), ())
+        ):
+            event_callback(interface_id, address, parameter, value)
+
+    def get_subscribed(self) -> list[tuple[str, str]]:
+        """Return the channel addresses and parameters with subscriptions."""
+        return list(self._central.entity_event_subscriptions)
@@ -1,6 +1,9 @@
 """Generic entity for the HomematicIP Cloud component."""
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from functools import partial
 import logging
 from typing import Any
 
@@ -9,11 +12,17 @@ from hahomematic.hub import BaseHubEntity
 
 from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.entity_registry import EntityRegistry
 
 from .control_unit import ControlUnit
-from .helper import get_entity_description
+from .helper import (
+    get_entity_description,
+    get_inbound_lane,
+    get_shared_attributes,
+)
+from .optimistic import DEFAULT_CONFIRM_TIMEOUT, OptimisticState
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +30,9 @@ _LOGGER = logging.getLogger(__name__)
 class HaHomematicGenericEntity(Entity):
     """Representation of the HomematicIP generic entity."""
 
+    # Optimistic values of entities, that send values to the device.
+    _optimistic: OptimisticState | None = None
+
     def __init__(
         self,
         control_unit: ControlUnit,
@@ -31,6 +43,10 @@ class HaHomematicGenericEntity(Entity):
         self._hm_entity = hm_entity
         if entity_description := get_entity_description(self._hm_entity):
             self.entity_description = entity_description
+        self._inbound_lane = get_inbound_lane(self._hm_entity)
+        self._device_address: str | None = None
+        if address := getattr(self._hm_entity, "address", None):
+            self._device_address = address.split(":")[0]
         # Marker showing that the Hm device hase been removed.
         self.hm_device_removed = False
         _LOGGER.info("Setting up %s", self.name)
@@ -38,6 +54,8 @@ class HaHomematicGenericEntity(Entity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
+        if self._device_address and self._cu.is_device_stale(self._device_address):
+            return False
         return self._hm_entity.available
 
     @property
@@ -56,9 +74,9 @@ class HaHomematicGenericEntity(Entity):
         )
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes of the generic entity."""
-        return self._hm_entity.extra_state_attributes
+        return get_shared_attributes(self._hm_entity.extra_state_attributes)
 
     @property
     def name(self) -> str:
@@ -78,8 +96,16 @@ class HaHomematicGenericEntity(Entity):
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
         if isinstance(self._hm_entity, (BaseHubEntity, CallbackEntity)):
-            self._hm_entity.register_update_callback(self._async_device_changed)
+            self._hm_entity.register_update_callback(self._device_changed)
             self._hm_entity.register_remove_callback(self._async_device_removed)
+        if self._device_address:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    self._cu.async_signal_device_liveness(),
+                    self._async_device_liveness_changed,
+                )
+            )
         self._cu.add_hm_entity(hm_entity=self._hm_entity)
         await self._init_data()
 
@@ -95,12 +121,69 @@ class HaHomematicGenericEntity(Entity):
         entity_registry: EntityRegistry = await er.async_get_registry(self.hass)
         entity_registry.async_update_entity(self.entity_id, disabled_by=disabled_by)
 
+    def _device_changed(self, *args, **kwargs) -> None:
+        """Queue the state update in the priority lane of the entity."""
+        if self._optimistic is not None:
+            # Acknowledge the commands, whose value is reported by the device.
+            for parameter in self._optimistic.parameters:
+                key = (self._hm_entity.unique_id, parameter)
+                if self._cu.acks.is_waiting(key):
+                    self._cu.acks.resolve(
+                        key, self._optimistic.get_device_value(parameter)
+                    )
+        self._cu.inbound_lanes.enqueue(
+            self._inbound_lane,
+            self._hm_entity.unique_id,
+            partial(self._async_device_changed, *args, **kwargs),
+        )
+
+    def _init_optimistic_state(self) -> OptimisticState:
+        """Create the optimistic state of the entity."""
+        self._optimistic = OptimisticState(
+            name=self._hm_entity.unique_id,
+            write_state=self.async_write_ha_state,
+            on_confirmed=partial(self._cu.record_round_trip, self._hm_entity),
+        )
+        return self._optimistic
+
+    @asynccontextmanager
+    async def _async_command(
+        self,
+        parameter: str,
+        value: Any,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+    ) -> AsyncIterator[None]:
+        """
+        Show the value of a command optimistically while it is sent.
+        If configured, wait until the device acknowledges the command.
+        """
+        assert self._optimistic is not None
+        if (
+            not (ack_timeout := self._cu.ack_timeout)
+            # The device won't report a value, that it already has.
+            or self._optimistic.get_device_value(parameter) == value
+        ):
+            async with self._optimistic.async_send(parameter, value, confirm_timeout):
+                yield
+            return
+        expected = [
+            self._cu.acks.expect(
+                (self._hm_entity.unique_id, parameter),
+                match=lambda reported: reported == value,
+            )
+        ]
+        async with self._cu.acks.async_acknowledged(expected, ack_timeout):
+            async with self._optimistic.async_send(parameter, value, confirm_timeout):
+                yield
+
     @callback
     def _async_device_changed(self, *args, **kwargs) -> None:
         """Handle device state changes."""
         # Don't update disabled entities
         if self.enabled:
             _LOGGER.debug("Event %s", self.name)
+            if self._optimistic is not None:
+                self._optimistic.confirm()
             self.async_write_ha_state()
         else:
             _LOGGER.debug(
@@ -108,8 +191,23 @@ class HaHomematicGenericEntity(Entity):
                 self.name,
             )
 
+    @callback
+    def _async_device_liveness_changed(self, device_address: str) -> None:
+        """Update the availability, when the device missed or resumed reports."""
+        if device_address == self._device_address and self.enabled:
+            self.async_write_ha_state()
+
     async def async_will_remove_from_hass(self) -> None:
         """Run when hmip device will be removed from hass."""
+        if self._optimistic is not None:
+            self._optimistic.rollback_all()
+
+        if self.registry_entry and self.registry_entry.disabled:
+            # Drop the callbacks until the entity gets enabled again.
+            self._hm_entity.unregister_update_callback()
+            self._hm_entity.unregister_remove_callback()
+            self._cu.park_hm_entity(self._hm_entity)
+            return
 
         # Only go further if the device/entity should be removed from registries
         # due to a removal of the HM device.
@@ -1,7 +1,9 @@
 """Support for HomeMatic sensors."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
+from types import MappingProxyType
 from typing import Any
 
 from hahomematic.const import HmPlatform
@@ -38,10 +40,19 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     VOLUME_CUBIC_METERS,
 )
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityDescription
 
+from .const import DOMAIN
+from .inbound import LANE_DIAGNOSTIC, LANE_NORMAL, LANE_SAFETY
+from .sampling import SamplingPolicy
+
 _LOGGER = logging.getLogger(__name__)
 
+DATA_UNRECORDED_HUB_ATTRIBUTES = f"{DOMAIN}_unrecorded_hub_attributes"
+_MAX_SHARED_ATTRIBUTES = 4096
+_SHARED_ATTRIBUTES: dict[frozenset, Mapping[str, Any]] = {}
+
 HM_STATE_HA_CAST = {
     "IPGarage": {0: "closed", 1: "open", 2: "ventilation", 3: None},
     "RotaryHandleSensor": {0: "closed", 1: "tilted", 2: "open"},
@@ -162,6 +173,7 @@ _SENSOR_DESCRIPTIONS_BY_PARAM: dict[str, SensorEntityDescription] = {
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     "GAS_POWER": SensorEntityDescription(
         key="GAS_POWER",
@@ -217,6 +229,8 @@ _SENSOR_DESCRIPTIONS_BY_PARAM: dict[str, SensorEntityDescription] = {
     "CARRIER_SENSE_LEVEL": SensorEntityDescription(
         key="CARRIER_SENSE_LEVEL",
         native_unit_of_measurement=PERCENTAGE,
+        entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     "DUTY_CYCLE_LEVEL": SensorEntityDescription(
         key="DUTY_CYCLE_LEVEL",
@@ -231,11 +245,13 @@ _SENSOR_DESCRIPTIONS_BY_PARAM: dict[str, SensorEntityDescription] = {
         key="RSSI_DEVICE",
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
         entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     "RSSI_PEER": SensorEntityDescription(
         key="RSSI_PEER",
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
         entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     "IP_ADDRESS": SensorEntityDescription(
         key="IP_ADDRESS",
@@ -424,6 +440,71 @@ _DEFAULT_DESCRIPTION: dict[HmPlatform, Any] = {
 }
 
 
+_SAMPLING_POLICIES_BY_DEVICE_CLASS: dict[str, SamplingPolicy] = {
+    SensorDeviceClass.POWER: SamplingPolicy(
+        min_interval=10, min_abs_delta=1.0, min_rel_delta=0.05, heartbeat=300
+    ),
+    SensorDeviceClass.CURRENT: SamplingPolicy(
+        min_interval=10, min_abs_delta=10.0, min_rel_delta=0.05, heartbeat=300
+    ),
+    SensorDeviceClass.VOLTAGE: SamplingPolicy(
+        min_interval=30, min_abs_delta=1.0, min_rel_delta=0.01, heartbeat=600
+    ),
+}
+
+_SAMPLING_POLICIES_BY_PARAM: dict[str, SamplingPolicy | None] = {
+    "FREQUENCY": SamplingPolicy(min_interval=30, min_abs_delta=0.1, heartbeat=600),
+    # Diagnostic values, that change slowly.
+    "OPERATING_VOLTAGE": None,
+}
+
+
+def get_sampling_policy(hm_entity: BaseEntity) -> SamplingPolicy | None:
+    """Get the default sampling policy of a sensor."""
+    if not isinstance(hm_entity, GenericEntity):
+        return None
+    if hm_entity.parameter in _SAMPLING_POLICIES_BY_PARAM:
+        return _SAMPLING_POLICIES_BY_PARAM[hm_entity.parameter]
+    if (
+        entity_description := get_entity_description(hm_entity)
+    ) is None or entity_description.device_class is None:
+        return None
+    return _SAMPLING_POLICIES_BY_DEVICE_CLASS.get(entity_description.device_class)
+
+
+_SAFETY_BINARY_SENSOR_DEVICE_CLASSES = {
+    BinarySensorDeviceClass.GAS,
+    BinarySensorDeviceClass.MOISTURE,
+    BinarySensorDeviceClass.SAFETY,
+    BinarySensorDeviceClass.SMOKE,
+}
+
+_SAFETY_PARAMS = {
+    "ALARMSTATE",
+    "SMOKE_DETECTOR_ALARM_STATUS",
+    "SMOKE_DETECTOR_TEST_RESULT",
+}
+
+_DIAGNOSTIC_ENTITY_CATEGORIES = {ENTITY_CATEGORY_DIAGNOSTIC, ENTITY_CATEGORY_SYSTEM}
+
+
+def get_inbound_lane(hm_entity: BaseEntity) -> str:
+    """Get the priority lane for the state updates of an entity."""
+    if getattr(hm_entity, "parameter", None) in _SAFETY_PARAMS:
+        return LANE_SAFETY
+    entity_description = get_entity_description(hm_entity)
+    if entity_description is None:
+        return LANE_NORMAL
+    if (
+        getattr(hm_entity, "platform", None) == HmPlatform.BINARY_SENSOR
+        and entity_description.device_class in _SAFETY_BINARY_SENSOR_DEVICE_CLASSES
+    ):
+        return LANE_SAFETY
+    if entity_description.entity_category in _DIAGNOSTIC_ENTITY_CATEGORIES:
+        return LANE_DIAGNOSTIC
+    return LANE_NORMAL
+
+
 def get_entity_description(hm_entity: BaseEntity) -> EntityDescription | None:
     """Get the entity_description for platform."""
     if isinstance(hm_entity, GenericEntity):
@@ -449,3 +530,29 @@ def get_entity_description(hm_entity: BaseEntity) -> EntityDescription | None:
     if hasattr(hm_entity, "platform"):
         return _DEFAULT_DESCRIPTION.get(hm_entity.platform, None)
     return None
+
+
+def get_shared_attributes(
+    attributes: Mapping[str, Any] | None,
+) -> Mapping[str, Any] | None:
+    """
+    Return an immutable instance of the attributes, that is shared by all
+    entities with identical attributes.
+    """
+    if not attributes:
+        return None
+    try:
+        key = frozenset(attributes.items())
+    except TypeError:
+        # Unhashable values can't be shared.
+        return attributes
+    if (shared := _SHARED_ATTRIBUTES.get(key)) is None:
+        if len(_SHARED_ATTRIBUTES) >= _MAX_SHARED_ATTRIBUTES:
+            _SHARED_ATTRIBUTES.clear()
+        shared = _SHARED_ATTRIBUTES[key] = MappingProxyType(dict(attributes))
+    return shared
+
+
+def get_unrecorded_hub_attributes(hass: HomeAssistant) -> set[str]:
+    """Return the attributes of the hubs, that are excluded from recording."""
+    return hass.data.setdefault(DATA_UNRECORDED_HUB_ATTRIBUTES, set())
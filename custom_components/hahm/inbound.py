@@ -0,0 +1,118 @@
+"""Priority lanes for the state updates of inbound CCU events."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from itertools import count
+import logging
+import threading
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+LANE_SAFETY = "safety"
+LANE_NORMAL = "normal"
+LANE_DIAGNOSTIC = "diagnostic"
+# Ordered by priority.
+LANES = (LANE_SAFETY, LANE_NORMAL, LANE_DIAGNOSTIC)
+# Lanes, whose pending updates of the same entity are merged. Every update
+# of the safety lane is written.
+MERGED_LANES = (LANE_NORMAL, LANE_DIAGNOSTIC)
+
+# Maximum number of state writes per loop iteration, so a burst of events
+# doesn't block the event loop.
+MAX_BATCH_SIZE = 50
+
+
+class LaneMetrics:
+    """Latency metrics of a lane."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a state update."""
+        self.count += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def avg_latency(self) -> float:
+        """Return the average latency in ms."""
+        if not self.count:
+            return 0.0
+        return round(self.total_latency / self.count * 1000, 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as dict."""
+        return {
+            "updates": self.count,
+            "avg_latency_ms": self.avg_latency,
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+        }
+
+
+class InboundLanes:
+    """
+    Queues the state updates of inbound events in priority lanes.
+    Safety updates are written before normal ones, diagnostic updates last.
+    Pending telemetry and diagnostic updates of the same entity are merged.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._lanes: dict[str, dict[Any, tuple[float, Callable[[], None]]]] = {
+            lane: {} for lane in LANES
+        }
+        self._sequence = count()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self.metrics = {lane: LaneMetrics() for lane in LANES}
+
+    def get_queue_depth(self, lane: str) -> int:
+        """Return the number of pending updates of a lane."""
+        return len(self._lanes[lane])
+
+    def enqueue(self, lane: str, key: str, job: Callable[[], None]) -> None:
+        """Queue a state update. Safe to call from any thread."""
+        with self._lock:
+            pending = self._lanes[lane]
+            if lane not in MERGED_LANES:
+                pending[next(self._sequence)] = (time.monotonic(), job)
+            elif (queued := pending.get(key)) is not None:
+                pending[key] = (queued[0], job)
+            else:
+                pending[key] = (time.monotonic(), job)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._hass.loop.call_soon_threadsafe(self._async_drain)
+
+    def _pop(self) -> tuple[str, float, Callable[[], None]] | None:
+        """Return the next update by priority. Lock must be held."""
+        for lane in LANES:
+            if pending := self._lanes[lane]:
+                queued, job = pending.pop(next(iter(pending)))
+                return lane, queued, job
+        return None
+
+    @callback
+    def _async_drain(self) -> None:
+        """Run the queued updates, highest priority first."""
+        for _ in range(MAX_BATCH_SIZE):
+            with self._lock:
+                if (item := self._pop()) is None:
+                    self._scheduled = False
+                    return
+            lane, queued, job = item
+            try:
+                job()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error writing state of inbound event")
+            self.metrics[lane].record(time.monotonic() - queued)
+        # Yield to the event loop and continue with the remaining updates.
+        self._hass.loop.call_soon(self._async_drain)
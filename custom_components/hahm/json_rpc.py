@@ -0,0 +1,241 @@
+"""Persistent JSON-RPC session to the CCU."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from aiohttp import ClientError, ClientSession
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .limiter import AdaptiveLimiter
+from .rpc_transport import (
+    DEFAULT_DEADLINES,
+    OPERATION_READ,
+    OPERATION_WRITE,
+    get_tls_context,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# The CCU drops sessions after a few minutes without activity.
+SESSION_RENEW_INTERVAL = 90
+# Error messages of the CCU for an expired or unknown session.
+_SESSION_ERRORS = ("access denied", "invalid session")
+
+_VALUE_TYPE_BOOL = 2
+_VALUE_TYPE_FLOAT = 4
+_VALUE_TYPE_INTEGER = 16
+
+
+class JsonRpcError(HomeAssistantError):
+    """Error to indicate a failed JSON-RPC call."""
+
+
+class JsonRpcTimeoutError(JsonRpcError, TimeoutError):
+    """Error to indicate a JSON-RPC call, that exceeded its deadline."""
+
+
+class JsonRpcSessionError(JsonRpcError):
+    """Error to indicate a JSON-RPC call with an expired session."""
+
+
+class JsonRpcSession:
+    """
+    JSON-RPC session to the CCU.
+    The login is kept and renewed instead of logging in and out per call.
+    """
+
+    def __init__(
+        self,
+        client_session: ClientSession,
+        host: str,
+        username: str,
+        password: str,
+        port: int | None = None,
+        tls: bool = False,
+        verify_tls: bool = False,
+        limiter: AdaptiveLimiter | None = None,
+        deadlines: dict[str, float] | None = None,
+    ) -> None:
+        self._client_session = client_session
+        self._limiter = limiter
+        self._deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self._username = username
+        self._password = password
+        scheme = "https" if tls else "http"
+        port = port or (443 if tls else 80)
+        self._url = f"{scheme}://{host}:{port}/api/homematic.cgi"
+        self._ssl = get_tls_context(verify_tls) if tls else None
+        self._session_id: str | None = None
+        self._last_activity = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _post(
+        self, method: str, params: dict[str, Any], operation: str = OPERATION_READ
+    ) -> Any:
+        """Post a JSON-RPC request within its deadline and return its result."""
+        payload = {"method": method, "params": params, "jsonrpc": "1.1"}
+        # The deadline includes the wait for a free slot.
+        timeout = self._deadlines.get(operation) or None
+        try:
+            data = await asyncio.wait_for(self._limited_request(payload), timeout)
+        except asyncio.TimeoutError as err:
+            raise JsonRpcTimeoutError(
+                f"{method} exceeded its deadline of {timeout}s"
+                if timeout
+                else f"{method} timed out"
+            ) from err
+        except (ClientError, ValueError) as err:
+            raise JsonRpcError(f"{method} failed: {err}") from err
+        if error := data.get("error"):
+            message = str(error.get("message", error))
+            if any(text in message.lower() for text in _SESSION_ERRORS):
+                raise JsonRpcSessionError(f"{method} failed: {message}")
+            raise JsonRpcError(f"{method} failed: {message}")
+        return data.get("result")
+
+    async def _limited_request(self, payload: dict[str, Any]) -> Any:
+        """Post a payload within the outbound limit."""
+        if self._limiter is None:
+            return await self._request(payload)
+        async with self._limiter.async_limited((ClientError, asyncio.TimeoutError)):
+            return await self._request(payload)
+
+    async def _request(self, payload: dict[str, Any]) -> Any:
+        """Post a payload and return the decoded response."""
+        async with self._client_session.post(
+            self._url, json=payload, ssl=self._ssl
+        ) as response:
+            return await response.json(content_type=None)
+
+    async def _ensure_session(self) -> str:
+        """Return a valid session id, renewing or logging in if required."""
+        async with self._lock:
+            if self._session_id is not None:
+                if time.monotonic() - self._last_activity < SESSION_RENEW_INTERVAL:
+                    return self._session_id
+                try:
+                    if await self._post(
+                        "Session.renew", {"_session_id_": self._session_id}
+                    ):
+                        self._last_activity = time.monotonic()
+                        return self._session_id
+                except JsonRpcError as err:
+                    _LOGGER.debug("Renewing JSON-RPC session failed: %s", err)
+                self._session_id = None
+
+            session_id = await self._post(
+                "Session.login",
+                {"username": self._username, "password": self._password},
+            )
+            if not session_id:
+                raise JsonRpcError("Session.login failed: no session id returned")
+            self._session_id = session_id
+            self._last_activity = time.monotonic()
+            return session_id
+
+    async def call(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        operation: str = OPERATION_READ,
+    ) -> Any:
+        """Call a JSON-RPC method within the session."""
+        for attempt in (0, 1):
+            session_id = await self._ensure_session()
+            try:
+                result = await self._post(
+                    method, {**(params or {}), "_session_id_": session_id}, operation
+                )
+            except JsonRpcSessionError:
+                if attempt:
+                    raise
+                # The session expired on the CCU. Login again once, other
+                # errors are not retried, the call may have been executed.
+                self._session_id = None
+                continue
+            self._last_activity = time.monotonic()
+            return result
+        return None
+
+    async def logout(self) -> None:
+        """Logout from the CCU."""
+        async with self._lock:
+            if self._session_id is None:
+                return
+            try:
+                await self._post("Session.logout", {"_session_id_": self._session_id})
+            except JsonRpcError as err:
+                _LOGGER.debug("JSON-RPC logout failed: %s", err)
+            self._session_id = None
+
+    async def run_script(self, script: str, operation: str = OPERATION_READ) -> str:
+        """Run a ReGa script and return its output."""
+        return await self.call("ReGa.runScript", {"script": script}, operation) or ""
+
+    async def get_system_variables(self, names: list[str]) -> dict[str, Any]:
+        """Read multiple system variables with a single script call."""
+        if not names:
+            return {}
+        lines = ["object sv;"]
+        for name in names:
+            quoted = _quote(name)
+            lines.append(
+                f"sv = dom.GetObject(ID_SYSTEM_VARIABLES).Get({quoted});"
+                f' if (sv) {{ WriteLine({quoted} # "\\t" # sv.ValueType()'
+                f' # "\\t" # sv.Value()); }}'
+            )
+        output = await self.run_script("\n".join(lines))
+        variables: dict[str, Any] = {}
+        for line in output.splitlines():
+            parts = line.split("\t", 2)
+            if len(parts) != 3:
+                continue
+            name, value_type, value = parts
+            variables[name] = _parse_value(value_type, value)
+        return variables
+
+    async def set_system_variables(self, values: dict[str, Any]) -> None:
+        """Write multiple system variables with a single script call."""
+        if not values:
+            return
+        lines = ["object sv;"]
+        for name, value in values.items():
+            lines.append(
+                f"sv = dom.GetObject(ID_SYSTEM_VARIABLES).Get({_quote(name)});"
+                f" if (sv) {{ sv.State({_format_value(value)}); }}"
+            )
+        await self.run_script("\n".join(lines), OPERATION_WRITE)
+
+
+def _quote(value: str) -> str:
+    """Quote a string for a ReGa script."""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _format_value(value: Any) -> str:
+    """Format a python value for a ReGa script."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return _quote(value)
+
+
+def _parse_value(value_type: str, value: str) -> Any:
+    """Convert the script output of a system variable to a python value."""
+    try:
+        vtype = int(value_type)
+        if vtype == _VALUE_TYPE_BOOL:
+            return value.strip().lower() == "true"
+        if vtype == _VALUE_TYPE_FLOAT:
+            return float(value)
+        if vtype == _VALUE_TYPE_INTEGER:
+            return int(float(value))
+    except ValueError:
+        pass
+    return value
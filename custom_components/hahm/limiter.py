@@ -0,0 +1,182 @@
+"""Adaptive concurrency limit for the outbound calls to a CCU."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+import logging
+import threading
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 16
+# Calls slower than this are handled like failed calls.
+DEFAULT_LATENCY_TARGET = 3.0
+DECREASE_FACTOR = 0.5
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit for concurrent calls to a CCU.
+    Every successful call raises the limit by 1/limit, so it grows by one
+    per round of calls. A failed or slow call halves it, at most once per
+    latency target, so a single overload doesn't collapse the limit.
+    Usable from the event loop and from executor threads.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        latency_target: float = DEFAULT_LATENCY_TARGET,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_target = latency_target
+        self._in_flight = 0
+        self._waiters: deque[Callable[[], None]] = deque()
+        self._last_decrease = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Return the current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of running calls."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter metrics as dict."""
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "calls": self.calls,
+            "failures": self.failures,
+            "decreases": self.decreases,
+        }
+
+    def _try_acquire(self) -> bool:
+        """Take a slot, if one is free. Lock must be held."""
+        if self._in_flight < self.limit:
+            self._in_flight += 1
+            return True
+        return False
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Wait for a slot. Blocks the calling thread."""
+        with self._lock:
+            if self._try_acquire():
+                return True
+            event = threading.Event()
+            self._waiters.append(event.set)
+        if event.wait(timeout):
+            return True
+        with self._lock:
+            if event.is_set():
+                # The slot was handed over meanwhile.
+                return True
+            self._waiters.remove(event.set)
+        return False
+
+    async def async_acquire(self) -> None:
+        """Wait for a slot without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future: asyncio.Future = loop.create_future()
+
+            def _handoff() -> None:
+                if future.cancelled():
+                    # Pass the slot on, the waiter is gone.
+                    self._release_slot()
+                else:
+                    future.set_result(None)
+
+            self._waiters.append(lambda: loop.call_soon_threadsafe(_handoff))
+        await future
+
+    def release(self, latency: float, failed: bool) -> None:
+        """Release a slot and adapt the limit to the result of the call."""
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.failures += 1
+            if failed or latency > self._latency_target:
+                if now - self._last_decrease > self._latency_target:
+                    self._last_decrease = now
+                    self.decreases += 1
+                    self._limit = max(
+                        float(self._min_limit), self._limit * DECREASE_FACTOR
+                    )
+                    _LOGGER.debug("Decreased outbound limit to %i", self.limit)
+            else:
+                self._limit = min(
+                    float(self._max_limit), self._limit + 1 / self._limit
+                )
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        """Free a slot and hand free slots to the waiters."""
+        wakeups = []
+        with self._lock:
+            self._in_flight -= 1
+            while self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                wakeups.append(self._waiters.popleft())
+        for wakeup in wakeups:
+            wakeup()
+
+    @contextmanager
+    def limited(
+        self,
+        failure_types: tuple[type[BaseException], ...],
+        timeout: float | None = None,
+    ) -> Iterator[None]:
+        """Run a blocking call within the limit."""
+        if not self.acquire(timeout):
+            raise TimeoutError(f"No free slot within {timeout:.1f}s")
+        start = time.monotonic()
+        failed = False
+        try:
+            yield
+        except failure_types:
+            failed = True
+            raise
+        finally:
+            self.release(time.monotonic() - start, failed)
+
+    @asynccontextmanager
+    async def async_limited(
+        self, failure_types: tuple[type[BaseException], ...]
+    ) -> AsyncIterator[None]:
+        """Run a call of the event loop within the limit."""
+        await self.async_acquire()
+        start = time.monotonic()
+        failed = False
+        try:
+            yield
+        except failure_types:
+            failed = True
+            raise
+        finally:
+            self.release(time.monotonic() - start, failed)
@@ -0,0 +1,212 @@
+"""Detection of devices, that stopped sending their cyclic reports."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Hashable
+import logging
+import math
+import statistics
+import threading
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+TICK_INTERVAL = 10.0
+WHEEL_SLOTS = 360
+# A device is stale, when it missed this many of its cyclic reports.
+STALE_FACTOR = 3.0
+MIN_STALE_TIMEOUT = 600.0
+# A cyclic report consists of the events of several parameters. Events
+# within this time after the first one belong to the same report.
+REPORT_WINDOW = 5.0
+# Types with longer gaps between reports are not considered cyclic.
+MAX_CYCLIC_INTERVAL = 6 * 3600.0
+# A type is learned from the recent gaps between reports of its devices.
+MIN_SAMPLES = 20
+MAX_SAMPLES = 50
+# Share of the gaps, that must be close to the median for a regular cycle.
+MIN_REGULAR_SHARE = 0.8
+REGULAR_SPREAD = 0.5
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel.
+    Scheduling, rescheduling and cancelling a timer cost O(1). Timeouts
+    longer than a revolution of the wheel are counted in rounds.
+    """
+
+    def __init__(
+        self, tick: float = TICK_INTERVAL, slots: int = WHEEL_SLOTS
+    ) -> None:
+        self._tick = tick
+        self._slots: list[dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._timers: dict[Hashable, int] = {}
+        self._cursor = 0
+        self._start = time.monotonic()
+        self._ticks = 0
+
+    def __len__(self) -> int:
+        """Return the number of scheduled timers."""
+        return len(self._timers)
+
+    def schedule(self, key: Hashable, timeout: float) -> None:
+        """Schedule or reschedule the timer of a key."""
+        self.cancel(key)
+        ticks = max(1, math.ceil(timeout / self._tick))
+        slot = (self._cursor + ticks) % len(self._slots)
+        self._slots[slot][key] = (ticks - 1) // len(self._slots)
+        self._timers[key] = slot
+
+    def cancel(self, key: Hashable) -> None:
+        """Cancel the timer of a key."""
+        if (slot := self._timers.pop(key, None)) is not None:
+            del self._slots[slot][key]
+
+    def advance(self) -> list[Hashable]:
+        """Advance the wheel to the current time and return the expired keys."""
+        expired: list[Hashable] = []
+        due = int((time.monotonic() - self._start) / self._tick)
+        while self._ticks < due:
+            self._ticks += 1
+            self._cursor = (self._cursor + 1) % len(self._slots)
+            bucket = self._slots[self._cursor]
+            for key, rounds in list(bucket.items()):
+                if rounds:
+                    bucket[key] = rounds - 1
+                    continue
+                del bucket[key]
+                del self._timers[key]
+                expired.append(key)
+        return expired
+
+
+class _TypeInterval:
+    """
+    Learned interval of the cyclic reports of a device type.
+    A type is cyclic, when most of its recent gaps are close to their
+    median. Event-driven types report at irregular gaps and are never
+    cyclic, and a type, that repeatedly shows long gaps, stops being so.
+    """
+
+    def __init__(self) -> None:
+        self._gaps: deque[float] = deque(maxlen=MAX_SAMPLES)
+        self.interval: float | None = None
+
+    @property
+    def stale_timeout(self) -> float | None:
+        """Return the time without reports, after which a device is stale."""
+        if self.interval is None:
+            return None
+        return max(self.interval * STALE_FACTOR, MIN_STALE_TIMEOUT)
+
+    def learn(self, gap: float) -> None:
+        """Learn the gap between two reports of a device."""
+        self._gaps.append(gap)
+        self.interval = self._get_cycle()
+
+    def _get_cycle(self) -> float | None:
+        """Return the interval of a regular cycle of the gaps, if any."""
+        if len(self._gaps) < MIN_SAMPLES:
+            return None
+        median = statistics.median(self._gaps)
+        if not 0 < median <= MAX_CYCLIC_INTERVAL:
+            return None
+        low, high = median * (1 - REGULAR_SPREAD), median * (1 + REGULAR_SPREAD)
+        regular = [gap for gap in self._gaps if low <= gap <= high]
+        if len(regular) < len(self._gaps) * MIN_REGULAR_SHARE:
+            return None
+        return max(regular)
+
+
+class _Device:
+    """Last report of a tracked device."""
+
+    def __init__(self, device_type: str) -> None:
+        self.device_type = device_type
+        # Start of the last report, None until the first one.
+        self.report_start: float | None = None
+        self.stale = False
+
+
+class DeviceLiveness:
+    """
+    Last-seen tracker of devices, fed by their inbound events.
+    The interval of the cyclic reports is learned per device type. A
+    device, that misses it several times, is stale until it reports again.
+    Safe to feed from the thread of the XML-RPC server.
+    """
+
+    def __init__(self, wheel: TimerWheel | None = None) -> None:
+        self._lock = threading.Lock()
+        self._wheel = wheel if wheel is not None else TimerWheel()
+        self._devices: dict[str, _Device] = {}
+        self._types: dict[str, _TypeInterval] = {}
+
+    def track(self, address: str, device_type: str) -> None:
+        """Start tracking a device."""
+        with self._lock:
+            if address not in self._devices:
+                self._devices[address] = _Device(device_type)
+                self._types.setdefault(device_type, _TypeInterval())
+
+    def untrack(self, address: str) -> None:
+        """Stop tracking a device."""
+        with self._lock:
+            self._devices.pop(address, None)
+            self._wheel.cancel(address)
+
+    def seen(self, address: str) -> bool:
+        """Record a report of a device. Return True, if it was stale."""
+        with self._lock:
+            if (device := self._devices.get(address)) is None:
+                return False
+            now = time.monotonic()
+            type_interval = self._types[device.device_type]
+            if device.report_start is None:
+                device.report_start = now
+            elif (gap := now - device.report_start) >= REPORT_WINDOW:
+                type_interval.learn(gap)
+                device.report_start = now
+            if (timeout := type_interval.stale_timeout) is not None:
+                self._wheel.schedule(address, timeout)
+            was_stale, device.stale = device.stale, False
+            return was_stale
+
+    def is_stale(self, address: str) -> bool:
+        """Return if a device missed its cyclic reports."""
+        return (device := self._devices.get(address)) is not None and device.stale
+
+    def expire(self) -> list[str]:
+        """Mark the devices stale, whose reports are overdue."""
+        stale: list[str] = []
+        with self._lock:
+            for address in self._wheel.advance():
+                if (device := self._devices.get(address)) is None:
+                    continue
+                device.stale = True
+                stale.append(address)
+        for address in stale:
+            _LOGGER.info("%s missed its cyclic reports", address)
+        return stale
+
+    @property
+    def stale_devices(self) -> int:
+        """Return the number of stale devices."""
+        with self._lock:
+            return sum(1 for device in self._devices.values() if device.stale)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracker metrics as dict."""
+        with self._lock:
+            learned = {
+                device_type: round(type_interval.interval)
+                for device_type, type_interval in sorted(self._types.items())
+                if type_interval.stale_timeout is not None
+            }
+        return {
+            "tracked_devices": len(self._devices),
+            "scheduled_timers": len(self._wheel),
+            "learned_intervals": learned,
+        }
@@ -16,9 +16,13 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .const import DOMAIN
 from .control_unit import ControlUnit
 from .generic_entity import HaHomematicGenericEntity
+from .optimistic import OptimisticState
 
 _LOGGER = logging.getLogger(__name__)
 
+# Key of the optimistic lock state.
+_PARAM_LOCKED = "LOCK_STATE"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -56,11 +60,19 @@ class HaHomematicLock(HaHomematicGenericEntity, LockEntity):
     """Representation of the HomematicIP lock entity."""
 
     _hm_entity: IpLock | RfLock
+    _optimistic: OptimisticState
+
+    def __init__(self, control_unit: ControlUnit, hm_entity) -> None:
+        """Initialize the lock entity."""
+        super().__init__(control_unit, hm_entity)
+        self._init_optimistic_state().track(
+            _PARAM_LOCKED, lambda: self._hm_entity.is_locked
+        )
 
     @property
     def is_locked(self):
         """Return true if lock is on."""
-        return self._hm_entity.is_locked
+        return self._optimistic.get(_PARAM_LOCKED)
 
     @property
     def supported_features(self) -> int:
@@ -69,12 +81,15 @@ class HaHomematicLock(HaHomematicGenericEntity, LockEntity):
 
     async def async_lock(self, **kwargs):
         """Lock the lock."""
-        await self._hm_entity.lock()
+        async with self._async_command(_PARAM_LOCKED, True):
+            await self._hm_entity.lock()
 
     async def async_unlock(self, **kwargs):
         """Unlock the lock."""
-        await self._hm_entity.unlock()
+        async with self._async_command(_PARAM_LOCKED, False):
+            await self._hm_entity.unlock()
 
     async def async_open(self, **kwargs: Any) -> None:
         """Open the lock."""
-        await self._hm_entity.open()
+        async with self._async_command(_PARAM_LOCKED, False):
+            await self._hm_entity.open()
@@ -0,0 +1,233 @@
+"""Interpolated positions of moving covers."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Interpolated positions are published at most once per interval.
+DEFAULT_UPDATE_INTERVAL = 1.0
+# Weight of a new observation in the learned travel time.
+LEARNING_RATE = 0.3
+# Shorter movements are too much affected by the RF latency to learn from.
+MIN_LEARN_DISTANCE = 20
+MIN_TRAVEL_TIME = 1.0
+MAX_TRAVEL_TIME = 600.0
+# Time to wait for the final LEVEL, after the cover should have arrived.
+MIN_OVERRUN = 30.0
+# Time to show the position of a stopped cover, without a reported LEVEL.
+HOLD_TIMEOUT = 30.0
+
+
+class _Movement:
+    """Movement of a cover towards a target position."""
+
+    def __init__(self, position: float, target: float, start_time: float) -> None:
+        self.origin = position
+        self.origin_time = start_time
+        self.position = position
+        self.start_time = self.origin_time
+        self.target = target
+
+    @property
+    def opening(self) -> bool:
+        """Return if the cover opens."""
+        return self.target > self.origin
+
+    @property
+    def distance(self) -> float:
+        """Return the total distance of the movement in percent."""
+        return abs(self.target - self.origin)
+
+
+class CoverMotion:
+    """
+    Movement model of a cover.
+    The position is interpolated by the travel time of the direction,
+    which is configured on the device or learned from the time between
+    sending a position and the LEVEL reported at its arrival.
+    A reported LEVEL always replaces the interpolated position.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write_state: Callable[[], None],
+        update_interval: float = DEFAULT_UPDATE_INTERVAL,
+    ) -> None:
+        self._name = name
+        self._write_state = write_state
+        self._update_interval = update_interval
+        # Travel time from closed to open (True) and from open to closed.
+        self._travel_times: dict[bool, float | None] = {True: None, False: None}
+        self._configured: set[bool] = set()
+        self._movement: _Movement | None = None
+        self._held_position: float | None = None
+        self._published: int | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._expiry: asyncio.TimerHandle | None = None
+
+    def configure(self, opening: float | None, closing: float | None) -> None:
+        """Set the travel times configured on the device."""
+        for direction, travel_time in ((True, opening), (False, closing)):
+            if travel_time and MIN_TRAVEL_TIME <= travel_time <= MAX_TRAVEL_TIME:
+                self._travel_times[direction] = float(travel_time)
+                self._configured.add(direction)
+            else:
+                self._configured.discard(direction)
+
+    def get_travel_time(self, opening: bool) -> float | None:
+        """Return the time for a full travel in a direction."""
+        return self._travel_times[opening]
+
+    @property
+    def is_moving(self) -> bool:
+        """Return if the cover is expected to move."""
+        return self._movement is not None
+
+    @property
+    def is_holding(self) -> bool:
+        """Return if the position of a stopped cover is held."""
+        return self._held_position is not None
+
+    @property
+    def is_opening(self) -> bool:
+        """Return if the cover is expected to open."""
+        return self._movement is not None and self._movement.opening
+
+    @property
+    def is_closing(self) -> bool:
+        """Return if the cover is expected to close."""
+        return self._movement is not None and not self._movement.opening
+
+    @property
+    def position(self) -> float | None:
+        """Return the interpolated position, None if unknown."""
+        if (movement := self._movement) is None:
+            return self._held_position
+        if (travel_time := self._travel_times[movement.opening]) is None:
+            return None
+        moved = (time.monotonic() - movement.start_time) / travel_time * 100
+        if movement.opening:
+            return min(movement.position + moved, movement.target)
+        return max(movement.position - moved, movement.target)
+
+    def start(
+        self, position: float | None, target: float, start_time: float | None = None
+    ) -> None:
+        """
+        Start a movement from the current position to a target.
+        The start time should be taken before the position is sent.
+        """
+        self._end()
+        self._held_position = None
+        if position is None or position == target:
+            return
+        if start_time is None:
+            start_time = time.monotonic()
+        movement = self._movement = _Movement(position, target, start_time)
+        loop = asyncio.get_running_loop()
+        overrun = MIN_OVERRUN
+        if (travel_time := self._travel_times[movement.opening]) is not None:
+            overrun += travel_time * movement.distance / 100
+            self._timer = loop.call_later(self._update_interval, self._update)
+        self._expiry = loop.call_later(overrun, self._expire)
+
+    def stop(self) -> None:
+        """
+        Hold the interpolated position, after the cover was stopped.
+        It is held until the device reports, at most for the hold timeout.
+        """
+        position = self.position
+        self._end()
+        self._held_position = position
+        if position is None:
+            return
+        self._expiry = asyncio.get_running_loop().call_later(
+            HOLD_TIMEOUT, self._release
+        )
+
+    def report(self, level: float | None) -> None:
+        """Handle a LEVEL reported by the device."""
+        if (movement := self._movement) is None or level is None:
+            self._end()
+            self._held_position = None
+            return
+        if abs(level - movement.target) < 1:
+            self._learn(movement)
+            self._end()
+            self._held_position = None
+        elif (level - movement.position) * (movement.target - movement.position) > 0:
+            # An intermediate position on the way, continue from there.
+            movement.position = level
+            movement.start_time = time.monotonic()
+        else:
+            # Stopped or moved elsewhere, e.g. by a button on the device.
+            self._end()
+            self._held_position = None
+
+    def cancel(self) -> None:
+        """End any movement."""
+        self._end()
+        self._held_position = None
+
+    def _learn(self, movement: _Movement) -> None:
+        """Learn the travel time of a direction from a finished movement."""
+        if movement.opening in self._configured:
+            return
+        if movement.distance < MIN_LEARN_DISTANCE:
+            return
+        observed = (time.monotonic() - movement.origin_time) / movement.distance * 100
+        if not MIN_TRAVEL_TIME <= observed <= MAX_TRAVEL_TIME:
+            return
+        if (travel_time := self._travel_times[movement.opening]) is not None:
+            observed = travel_time + LEARNING_RATE * (observed - travel_time)
+        self._travel_times[movement.opening] = observed
+        _LOGGER.debug(
+            "Learned %s time of %s: %.1fs",
+            "opening" if movement.opening else "closing",
+            self._name,
+            observed,
+        )
+
+    def _update(self) -> None:
+        """Publish the interpolated position, while the cover moves."""
+        self._timer = None
+        if self._movement is None or (position := self.position) is None:
+            return
+        if (rounded := round(position)) != self._published:
+            self._published = rounded
+            self._write_state()
+        if position != self._movement.target:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._update_interval, self._update
+            )
+
+    def _expire(self) -> None:
+        """Give up on a movement, whose final LEVEL never arrived."""
+        self._expiry = None
+        if self._movement is None:
+            return
+        _LOGGER.debug("%s did not report the end of its movement", self._name)
+        self._end()
+        self._write_state()
+
+    def _release(self) -> None:
+        """Drop the held position, if the device did not report in time."""
+        self._expiry = None
+        if self._held_position is None:
+            return
+        self._held_position = None
+        self._write_state()
+
+    def _end(self) -> None:
+        """End the current movement."""
+        self._movement = None
+        self._published = None
+        for timer in (self._timer, self._expiry):
+            if timer is not None:
+                timer.cancel()
+        self._timer = self._expiry = None
@@ -0,0 +1,201 @@
+"""Optimistic states of entities, until they are confirmed by the CCU."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONFIRM_TIMEOUT = 10.0
+# Number of devices with their round trip time in the attributes.
+SLOWEST_DEVICES = 10
+
+
+class _Pending:
+    """Optimistic value of a parameter, waiting for confirmation."""
+
+    def __init__(self, value: Any, timer: asyncio.TimerHandle) -> None:
+        self.value = value
+        self.sent = time.monotonic()
+        self.timer = timer
+
+
+class OptimisticState:
+    """
+    Optimistic values of an entity per parameter.
+    A value is shown as soon as it is sent. It is confirmed by an event
+    with the same value, and rolled back to the state of the device if
+    sending fails or no confirmation arrives within the timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write_state: Callable[[], None],
+        on_confirmed: Callable[[float], None] | None = None,
+    ) -> None:
+        self._name = name
+        self._write_state = write_state
+        self._on_confirmed = on_confirmed
+        self._getters: dict[str, Callable[[], Any]] = {}
+        self._pending: dict[str, _Pending] = {}
+
+    def track(self, parameter: str, getter: Callable[[], Any]) -> None:
+        """Register the getter of the device value of a parameter."""
+        self._getters[parameter] = getter
+
+    @property
+    def parameters(self) -> list[str]:
+        """Return the tracked parameters."""
+        return list(self._getters)
+
+    def get_device_value(self, parameter: str) -> Any:
+        """Return the value of a parameter reported by the device."""
+        return self._getters[parameter]()
+
+    def get(self, parameter: str) -> Any:
+        """Return the optimistic value of a parameter, or the device value."""
+        if (pending := self._pending.get(parameter)) is not None:
+            return pending.value
+        return self._getters[parameter]()
+
+    def is_pending(self, parameter: str) -> bool:
+        """Return if the value of a parameter is not confirmed yet."""
+        return parameter in self._pending
+
+    @asynccontextmanager
+    async def async_send(
+        self,
+        parameter: str,
+        value: Any,
+        timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+    ) -> AsyncIterator[None]:
+        """Show the value while it is sent, roll back if sending fails."""
+        if (current := self._getters[parameter]()) is None or current == value:
+            # Without a device value, there is nothing to confirm, and a
+            # value, that the device already has, won't be reported again.
+            self.rollback(parameter)
+            yield
+            return
+        self._set_pending(parameter, value, timeout)
+        try:
+            yield
+        except Exception:
+            self.rollback(parameter)
+            raise
+
+    def _set_pending(self, parameter: str, value: Any, timeout: float) -> None:
+        """Show an optimistic value of a parameter."""
+        self._drop(parameter)
+        loop = asyncio.get_running_loop()
+        timer = loop.call_later(timeout, self._timeout, parameter)
+        self._pending[parameter] = _Pending(value, timer)
+        self._write_state()
+
+    def confirm(self) -> None:
+        """Confirm the pending values, that are reported by the device."""
+        for parameter, pending in list(self._pending.items()):
+            if self._getters[parameter]() != pending.value:
+                continue
+            self._drop(parameter)
+            if self._on_confirmed is not None:
+                self._on_confirmed(time.monotonic() - pending.sent)
+
+    def rollback(self, parameter: str) -> None:
+        """Drop the optimistic value of a parameter and show the device value."""
+        if self._drop(parameter):
+            self._write_state()
+
+    def rollback_all(self) -> None:
+        """Drop all optimistic values."""
+        for parameter in list(self._pending):
+            self._drop(parameter)
+
+    def _timeout(self, parameter: str) -> None:
+        """Roll back a value, that was not confirmed in time."""
+        if (pending := self._pending.get(parameter)) is None:
+            return
+        _LOGGER.warning(
+            "%s of %s was not confirmed within %.0fs",
+            parameter,
+            self._name,
+            time.monotonic() - pending.sent,
+        )
+        self.rollback(parameter)
+
+    def _drop(self, parameter: str) -> bool:
+        """Drop the pending value of a parameter."""
+        if (pending := self._pending.pop(parameter, None)) is None:
+            return False
+        pending.timer.cancel()
+        return True
+
+
+class RoundTripMetrics:
+    """Time from sending a value until it is confirmed by the device."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last = 0.0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the round trip time of a value."""
+        self.count += 1
+        self.last = latency
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    @property
+    def last_ms(self) -> float:
+        """Return the last round trip time in ms."""
+        return round(self.last * 1000)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as dict."""
+        return {
+            "confirmed_values": self.count,
+            "avg_round_trip_ms": round(self.total / self.count * 1000)
+            if self.count
+            else 0,
+            "max_round_trip_ms": round(self.max * 1000),
+        }
+
+
+class DeviceRoundTrips:
+    """Round trip times of all devices, with the slowest devices."""
+
+    def __init__(self) -> None:
+        self.total = RoundTripMetrics()
+        self._devices: dict[str, tuple[str, RoundTripMetrics]] = {}
+
+    def record(self, device_address: str, device_name: str, latency: float) -> None:
+        """Record the round trip time of a value sent to a device."""
+        if (device := self._devices.get(device_address)) is None:
+            device = self._devices[device_address] = (
+                device_name,
+                RoundTripMetrics(),
+            )
+        device[1].record(latency)
+        self.total.record(latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics with the average of the slowest devices as dict."""
+        slowest = sorted(
+            self._devices.values(),
+            key=lambda device: device[1].total / device[1].count,
+            reverse=True,
+        )[:SLOWEST_DEVICES]
+        return {
+            **self.total.as_dict(),
+            "devices": len(self._devices),
+            "slowest_devices": {
+                name: metrics.as_dict()["avg_round_trip_ms"]
+                for name, metrics in slowest
+            },
+        }
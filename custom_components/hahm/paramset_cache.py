@@ -0,0 +1,96 @@
+"""Read-through cache for the MASTER paramsets of the devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+PARAMSET_KEY_MASTER = "MASTER"
+# MASTER paramsets only change by configuration.
+DEFAULT_TTL = 3600
+
+
+class MasterParamsetCache:
+    """
+    Cache of the MASTER paramsets of channels, grouped by device.
+    All entities of a device share the cached paramsets, and concurrent
+    reads of the same channel result in a single getParamset call.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str], Awaitable[dict[str, Any]]],
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self._fetch = fetch
+        self._ttl = ttl
+        self._devices: dict[str, dict[str, tuple[float, dict[str, Any]]]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_cached(self, address: str) -> dict[str, Any] | None:
+        """Return the cached paramset of a channel, even if expired."""
+        if entry := self._devices.get(_device_address(address), {}).get(address):
+            return entry[1]
+        return None
+
+    async def async_get(self, interface_id: str, address: str) -> dict[str, Any]:
+        """Return the paramset of a channel, reading it if not cached."""
+        if entry := self._devices.get(_device_address(address), {}).get(address):
+            if time.monotonic() - entry[0] < self._ttl:
+                self.hits += 1
+                return entry[1]
+        return await self.async_refresh(interface_id, address)
+
+    async def async_refresh(self, interface_id: str, address: str) -> dict[str, Any]:
+        """Read the paramset of a channel and update the cache."""
+        if (pending := self._pending.get(address)) is not None:
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[address] = future
+        try:
+            paramset = await self._fetch(interface_id, address)
+        except Exception as err:
+            future.set_exception(err)
+            # Don't warn about an exception, that nobody retrieved.
+            future.exception()
+            raise
+        else:
+            self._devices.setdefault(_device_address(address), {})[address] = (
+                time.monotonic(),
+                paramset,
+            )
+            future.set_result(paramset)
+            return paramset
+        finally:
+            del self._pending[address]
+
+    def invalidate(self, address: str) -> None:
+        """Drop the cached paramsets of the device of an address."""
+        if self._devices.pop(_device_address(address), None) is not None:
+            _LOGGER.debug("Invalidated MASTER paramsets of %s", address)
+
+    def clear(self) -> None:
+        """Drop all cached paramsets."""
+        self._devices.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache metrics as dict."""
+        return {
+            "devices": len(self._devices),
+            "channels": sum(len(channels) for channels in self._devices.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _device_address(address: str) -> str:
+    """Return the device address of a channel address."""
+    return address.split(":")[0]
@@ -0,0 +1,297 @@
+"""Batched polling of parameters, that are not pushed by the CCU."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import suppress
+from fnmatch import fnmatchcase
+import heapq
+import logging
+import time
+from typing import Any
+import zlib
+
+from hahomematic.entity import GenericEntity
+
+from .const import (
+    CONF_POLL_DEVICE_TYPES,
+    CONF_POLL_INTERFACES,
+    CONF_POLL_PARAMETERS,
+    CONF_POLL_WITHOUT_EVENTS,
+)
+from .entity_filter import split_option
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 30.0
+# getParamset calls per minute and interface.
+DEFAULT_POLL_BUDGET = 30
+# The interval of a device adapts between these multiples of the default.
+MIN_INTERVAL_FACTOR = 0.5
+MAX_INTERVAL_FACTOR = 8.0
+SPEEDUP_FACTOR = 0.5
+SLOWDOWN_FACTOR = 1.25
+
+_UNSET = object()
+_PARAM_OPERATIONS = "OPERATIONS"
+_OPERATION_READ = 1
+_OPERATION_EVENT = 4
+
+
+class PollFilter:
+    """
+    Selects the parameters, that must be polled.
+    Devices of the configured interfaces and device types don't push at
+    all, so all their readable parameters are polled. Other parameters
+    are only polled, if they are configured, or if polling of readable
+    parameters without events is enabled.
+    """
+
+    def __init__(
+        self,
+        interfaces: Iterable[str] = (),
+        device_types: Iterable[str] = (),
+        parameters: Iterable[str] = (),
+        without_events: bool = False,
+    ) -> None:
+        self._interfaces = tuple(pattern.upper() for pattern in interfaces)
+        self._device_types = tuple(pattern.upper() for pattern in device_types)
+        self._parameters = tuple(pattern.upper() for pattern in parameters)
+        self._without_events = without_events
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> PollFilter:
+        """Create the filter from the config entry options."""
+        return cls(
+            interfaces=split_option(options.get(CONF_POLL_INTERFACES)),
+            device_types=split_option(options.get(CONF_POLL_DEVICE_TYPES)),
+            parameters=split_option(options.get(CONF_POLL_PARAMETERS)),
+            without_events=options.get(CONF_POLL_WITHOUT_EVENTS, False),
+        )
+
+    def is_poll_only(
+        self, hm_entity: Any, interface_name: str, device_type: str
+    ) -> bool:
+        """Return if the value of a hm-entity must be polled."""
+        if not isinstance(hm_entity, GenericEntity):
+            return False
+        # pylint: disable=protected-access
+        parameter_data = getattr(hm_entity, "_parameter_data", None) or {}
+        operations = parameter_data.get(_PARAM_OPERATIONS)
+        if operations is not None and not operations & _OPERATION_READ:
+            return False
+        if _matches((interface_name, hm_entity.interface_id), self._interfaces):
+            return True
+        if _matches((device_type,), self._device_types):
+            return True
+        if _matches((hm_entity.parameter,), self._parameters):
+            return True
+        return (
+            self._without_events
+            and operations is not None
+            and not operations & _OPERATION_EVENT
+        )
+
+
+class _TokenBucket:
+    """Poll budget of an interface."""
+
+    def __init__(self, calls_per_minute: float) -> None:
+        self._rate = calls_per_minute / 60
+        # A small burst, so the calls stay spread over the minute.
+        self._capacity = max(1.0, calls_per_minute / 10)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+
+    def take(self, cost: int) -> float:
+        """Take tokens for calls. Return the delay, if the budget is exhausted."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last) * self._rate
+        )
+        self._last = now
+        # Larger devices may overdraw, the debt delays the following calls.
+        if self._tokens >= min(cost, self._capacity):
+            self._tokens -= cost
+            return 0.0
+        return (min(cost, self._capacity) - self._tokens) / self._rate
+
+
+class _PolledDevice:
+    """Polled channels and parameters of a device."""
+
+    def __init__(self, interface_id: str, address: str, interval: float) -> None:
+        self.interface_id = interface_id
+        self.address = address
+        self.channels: dict[str, set[str]] = {}
+        self.values: dict[tuple[str, str], Any] = {}
+        self.interval = interval
+        self.due = 0.0
+        self.polling = False
+
+
+class PollScheduler:
+    """
+    Polls the parameters of a device with a getParamset per channel.
+    The devices are spread over the interval, and the interval of each
+    device shrinks when its values change and grows when they don't.
+    The calls per interface are limited by a budget, so polling doesn't
+    crowd out interactive calls.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str], Awaitable[dict[str, Any]]],
+        publish: Callable[[str, str, dict[str, Any]], None],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        budget: float = DEFAULT_POLL_BUDGET,
+    ) -> None:
+        self._fetch = fetch
+        self._publish = publish
+        self._interval = interval
+        self._budget = budget
+        self._devices: dict[str, _PolledDevice] = {}
+        self._budgets: dict[str, _TokenBucket] = {}
+        self._queue: list[tuple[float, str]] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._polls: set[asyncio.Task] = set()
+        self.calls = 0
+        self.changes = 0
+        self.deferred = 0
+        self.failures = 0
+
+    @property
+    def devices(self) -> int:
+        """Return the number of polled devices."""
+        return len(self._devices)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the polling metrics as dict."""
+        return {
+            "parameters": sum(
+                len(parameters)
+                for device in self._devices.values()
+                for parameters in device.channels.values()
+            ),
+            "calls": self.calls,
+            "changes": self.changes,
+            "deferred_by_budget": self.deferred,
+            "failures": self.failures,
+        }
+
+    def add(self, interface_id: str, address: str, parameter: str) -> None:
+        """Poll a parameter of a channel."""
+        device_address = address.split(":")[0]
+        if (device := self._devices.get(device_address)) is None:
+            device = self._devices[device_address] = _PolledDevice(
+                interface_id, device_address, self._interval
+            )
+            # Spread the devices over the interval.
+            offset = zlib.crc32(device_address.encode()) % 1000 / 1000
+            self._schedule(device, time.monotonic() + self._interval * offset)
+        device.channels.setdefault(address, set()).add(parameter)
+
+    def remove_device(self, address: str) -> None:
+        """Stop polling a device."""
+        self._devices.pop(address.split(":")[0], None)
+
+    def start(self) -> None:
+        """Start polling."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        for task in (self._task, *self._polls):
+            if task is not None:
+                task.cancel()
+        for task in (self._task, *self._polls):
+            if task is not None:
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._task = None
+
+    def _schedule(self, device: _PolledDevice, due: float) -> None:
+        """Queue the next poll of a device."""
+        device.due = due
+        heapq.heappush(self._queue, (due, device.address))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Start the polls, that are due."""
+        while True:
+            now = time.monotonic()
+            while self._queue and self._queue[0][0] <= now:
+                due, address = heapq.heappop(self._queue)
+                device = self._devices.get(address)
+                if device is None or device.due != due or device.polling:
+                    continue
+                budget = self._budgets.get(device.interface_id)
+                if budget is None:
+                    budget = self._budgets[device.interface_id] = _TokenBucket(
+                        self._budget
+                    )
+                if delay := budget.take(len(device.channels)):
+                    self.deferred += 1
+                    self._schedule(device, now + delay)
+                    continue
+                device.polling = True
+                task = asyncio.create_task(self._poll(device))
+                self._polls.add(task)
+                task.add_done_callback(self._polls.discard)
+            self._wakeup.clear()
+            timeout = self._queue[0][0] - now if self._queue else None
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _poll(self, device: _PolledDevice) -> None:
+        """Read the channels of a device and publish changed values."""
+        changed = False
+        try:
+            for channel_address, parameters in list(device.channels.items()):
+                try:
+                    paramset = await self._fetch(device.interface_id, channel_address)
+                except Exception as err:  # pylint: disable=broad-except
+                    self.failures += 1
+                    _LOGGER.debug("Polling %s failed: %s", channel_address, err)
+                    continue
+                finally:
+                    self.calls += 1
+                values: dict[str, Any] = {}
+                for parameter in parameters:
+                    if parameter not in paramset:
+                        continue
+                    key = (channel_address, parameter)
+                    if device.values.get(key, _UNSET) == paramset[parameter]:
+                        continue
+                    # The first poll only sets the baseline.
+                    changed = changed or key in device.values
+                    device.values[key] = values[parameter] = paramset[parameter]
+                if values:
+                    self._publish(device.interface_id, channel_address, values)
+        finally:
+            device.polling = False
+            if changed:
+                self.changes += 1
+                device.interval = max(
+                    device.interval * SPEEDUP_FACTOR,
+                    self._interval * MIN_INTERVAL_FACTOR,
+                )
+            else:
+                device.interval = min(
+                    device.interval * SLOWDOWN_FACTOR,
+                    self._interval * MAX_INTERVAL_FACTOR,
+                )
+            if self._devices.get(device.address) is device:
+                self._schedule(device, time.monotonic() + device.interval)
+
+
+def _matches(values: Iterable[str | None], patterns: tuple[str, ...]) -> bool:
+    """Return if any of the values matches any of the patterns."""
+    return any(
+        fnmatchcase(value.upper(), pattern)
+        for value in values
+        if value
+        for pattern in patterns
+    )
@@ -0,0 +1,186 @@
+"""Reconnect scheduler for the interfaces of all control units."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RECONNECT_SCHEDULER = f"{DOMAIN}_reconnect_scheduler"
+
+CHECK_INTERVAL = 15
+BACKOFF_BASE_DELAY = 5
+BACKOFF_MAX_DELAY = 600
+# Maximum number of interfaces reconnecting at the same time.
+MAX_CONCURRENT_RECONNECTS = 2
+
+STATE_CONNECTED = "connected"
+STATE_DISCONNECTED = "disconnected"
+STATE_RECONNECTING = "reconnecting"
+
+
+class _InterfaceState:
+    """Connection state of an interface."""
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[bool]],
+        reconnect: Callable[[], Awaitable[None]],
+    ) -> None:
+        self.check = check
+        self.reconnect = reconnect
+        self.state = STATE_CONNECTED
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.last_error: str | None = None
+        self.cancel_timer: CALLBACK_TYPE | None = None
+
+
+class ReconnectScheduler:
+    """
+    Schedules connection checks and reconnects.
+    Disconnected interfaces retry with exponential backoff and jitter, and
+    the number of concurrent reconnects is capped, so the interfaces don't
+    all hit the CCU at once when it comes back.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = MAX_CONCURRENT_RECONNECTS,
+    ) -> None:
+        self._hass = hass
+        self._interfaces: dict[str, _InterfaceState] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._max_concurrent = max_concurrent
+        self._in_progress = 0
+
+    def add_interface(
+        self,
+        interface_id: str,
+        check: Callable[[], Awaitable[bool]],
+        reconnect: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Start checking an interface."""
+        self.remove_interface(interface_id)
+        self._interfaces[interface_id] = _InterfaceState(check, reconnect)
+        # Spread the checks of the interfaces over the interval.
+        self._schedule(interface_id, random.uniform(0, CHECK_INTERVAL))
+
+    def remove_interface(self, interface_id: str) -> None:
+        """Stop checking an interface."""
+        if interface_state := self._interfaces.pop(interface_id, None):
+            if interface_state.cancel_timer:
+                interface_state.cancel_timer()
+
+    def get_state(self, interface_id: str) -> str | None:
+        """Return the connection state of an interface."""
+        if interface_state := self._interfaces.get(interface_id):
+            return interface_state.state
+        return None
+
+    def get_attributes(self, interface_id: str) -> dict[str, Any]:
+        """Return the scheduler details of an interface."""
+        if (interface_state := self._interfaces.get(interface_id)) is None:
+            return {}
+        return {
+            "failures": interface_state.failures,
+            "next_attempt_in": max(
+                0, round(interface_state.next_attempt - time.monotonic())
+            ),
+            "last_error": interface_state.last_error,
+            "reconnects_in_progress": self._in_progress,
+            "max_concurrent_reconnects": self._max_concurrent,
+        }
+
+    def _schedule(self, interface_id: str, delay: float) -> None:
+        """Schedule the next check of an interface."""
+        interface_state = self._interfaces[interface_id]
+        interface_state.next_attempt = time.monotonic() + delay
+
+        @callback
+        def _run(now) -> None:
+            interface_state.cancel_timer = None
+            self._hass.async_create_task(self._async_run(interface_id))
+
+        interface_state.cancel_timer = async_call_later(self._hass, delay, _run)
+
+    async def _async_run(self, interface_id: str) -> None:
+        """Check an interface and reconnect it if required."""
+        if (interface_state := self._interfaces.get(interface_id)) is None:
+            return
+
+        if interface_state.state == STATE_CONNECTED:
+            if await self._async_check(interface_state):
+                self._reschedule(interface_id, interface_state, CHECK_INTERVAL)
+                return
+            _LOGGER.warning("Connection to %s lost", interface_id)
+            interface_state.state = STATE_DISCONNECTED
+            interface_state.failures = 0
+            self._reschedule(interface_id, interface_state, _get_backoff_delay(0))
+            return
+
+        async with self._semaphore:
+            self._in_progress += 1
+            interface_state.state = STATE_RECONNECTING
+            try:
+                if await self._async_check(interface_state):
+                    await interface_state.reconnect()
+                    interface_state.state = STATE_CONNECTED
+                    interface_state.failures = 0
+                    interface_state.last_error = None
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Reconnecting %s failed: %s", interface_id, err)
+                interface_state.last_error = str(err)
+            finally:
+                self._in_progress -= 1
+
+        if interface_state.state == STATE_CONNECTED:
+            self._reschedule(interface_id, interface_state, CHECK_INTERVAL)
+            return
+        interface_state.state = STATE_DISCONNECTED
+        interface_state.failures += 1
+        self._reschedule(
+            interface_id,
+            interface_state,
+            _get_backoff_delay(interface_state.failures),
+        )
+
+    # pylint: disable=no-self-use
+    async def _async_check(self, interface_state: _InterfaceState) -> bool:
+        """Return if the interface is connected."""
+        try:
+            return await interface_state.check()
+        except Exception as err:  # pylint: disable=broad-except
+            interface_state.last_error = str(err)
+            return False
+
+    def _reschedule(
+        self, interface_id: str, interface_state: _InterfaceState, delay: float
+    ) -> None:
+        """Schedule the next run if the interface was not removed meanwhile."""
+        if self._interfaces.get(interface_id) is interface_state:
+            self._schedule(interface_id, delay)
+
+
+def _get_backoff_delay(failures: int) -> float:
+    """Return the exponential backoff delay with jitter."""
+    delay = min(BACKOFF_MAX_DELAY, BACKOFF_BASE_DELAY * 2 ** min(failures, 16))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+@callback
+def get_reconnect_scheduler(hass: HomeAssistant) -> ReconnectScheduler:
+    """Return the reconnect scheduler shared by all control units."""
+    if (scheduler := hass.data.get(DATA_RECONNECT_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_RECONNECT_SCHEDULER] = ReconnectScheduler(hass)
+    return scheduler
@@ -0,0 +1,13 @@
+"""Integration platform for recorder."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+
+from .helper import get_unrecorded_hub_attributes
+
+
+@callback
+def exclude_attributes(hass: HomeAssistant) -> set[str]:
+    """Exclude the system variable snapshot of the hub from being recorded."""
+    # The set is updated, when the hub learns about new system variables.
+    return get_unrecorded_hub_attributes(hass)
@@ -0,0 +1,546 @@
+"""Pooled keep-alive transport for outbound XML-RPC calls."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from functools import partial
+import http.client
+import logging
+import re
+import socket
+import ssl
+import threading
+import time
+from typing import Any
+import xmlrpc.client
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .limiter import AdaptiveLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+# Socket timeout of new connections, until the deadline of a call applies.
+DEFAULT_CONNECTION_TIMEOUT = 30.0
+# Bytes read from a response per parser feed.
+READ_CHUNK_SIZE = 16384
+
+OPERATION_READ = "read"
+OPERATION_WRITE = "write"
+OPERATION_PARAMSET_WRITE = "paramset_write"
+OPERATION_INIT = "init"
+# Methods without an operation of their own, e.g. ping.
+OPERATION_OTHER = "other"
+# Deadlines in seconds, including the wait for a free slot.
+DEFAULT_DEADLINES = {
+    OPERATION_READ: 20.0,
+    OPERATION_WRITE: 10.0,
+    OPERATION_PARAMSET_WRITE: 20.0,
+    # The CCU may call back the XML-RPC server before it answers init.
+    OPERATION_INIT: 60.0,
+    OPERATION_OTHER: 30.0,
+}
+
+_METHOD_OPERATIONS = {
+    b"init": OPERATION_INIT,
+    b"setValue": OPERATION_WRITE,
+    b"putParamset": OPERATION_PARAMSET_WRITE,
+    b"getValue": OPERATION_READ,
+    b"getParamset": OPERATION_READ,
+    b"getParamsetDescription": OPERATION_READ,
+    b"getDeviceDescription": OPERATION_READ,
+    b"listDevices": OPERATION_READ,
+    b"getLinks": OPERATION_READ,
+    b"getLinkPeers": OPERATION_READ,
+    b"getInstallMode": OPERATION_READ,
+}
+_METHOD_NAME = re.compile(rb"<methodName>\s*([\w.]+)\s*</methodName>")
+
+# Parses a response, calling the callback before every read.
+_ResponseParser = Callable[[http.client.HTTPResponse, Callable[[], None]], Any]
+
+# Name mangled attribute of the transport of a ServerProxy.
+_PROXY_TRANSPORT = "_ServerProxy__transport"
+
+# Errors, that indicate an overloaded or unreachable CCU.
+_FAILURE_TYPES = (OSError, http.client.HTTPException, xmlrpc.client.ProtocolError)
+
+
+class RpcTimeoutError(HomeAssistantError, TimeoutError):
+    """Error to indicate an RPC call, that exceeded its deadline."""
+
+
+def get_method_name(request_body: bytes) -> str:
+    """Return the method name of an XML-RPC request."""
+    if match := _METHOD_NAME.search(request_body, 0, 512):
+        return match.group(1).decode()
+    return ""
+
+
+def get_operation(method_name: str) -> str:
+    """Return the operation of an XML-RPC method."""
+    return _METHOD_OPERATIONS.get(method_name.encode(), OPERATION_OTHER)
+
+
+class TransportMetrics:
+    """Connection metrics of a pooled transport."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reused = 0
+        self.handshakes = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def record(self, wait_time: float, reused: bool) -> None:
+        """Record a connection checkout."""
+        with self._lock:
+            self.requests += 1
+            if reused:
+                self.reused += 1
+            else:
+                self.handshakes += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+    @property
+    def reuse_rate(self) -> float:
+        """Return the percentage of requests served by a reused connection."""
+        if not self.requests:
+            return 0.0
+        return round(self.reused / self.requests * 100, 1)
+
+    @property
+    def avg_wait_time(self) -> float:
+        """Return the average pool wait time in ms."""
+        if not self.requests:
+            return 0.0
+        return round(self.total_wait_time / self.requests * 1000, 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as dict."""
+        return {
+            "requests": self.requests,
+            "reused_connections": self.reused,
+            "handshakes": self.handshakes,
+            "avg_pool_wait_ms": self.avg_wait_time,
+            "max_pool_wait_ms": round(self.max_wait_time * 1000, 2),
+        }
+
+
+class PooledTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport with a pool of persistent connections.
+    The stdlib transport caches a single connection, which is not safe
+    for the concurrent executor calls of the hahomematic proxy.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._pool_size = max(1, pool_size)
+        self._idle_timeout = idle_timeout
+        self._connection_timeout = connection_timeout
+        self._idle: deque[tuple[http.client.HTTPConnection, float]] = deque()
+        self._open_connections = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self.metrics = TransportMetrics()
+        # Concurrency limit shared by all outbound calls to the CCU.
+        self.limiter: AdaptiveLimiter | None = None
+        # Deadline per operation, a missing or zero deadline disables it.
+        self.deadlines: dict[str, float] = dict(DEFAULT_DEADLINES)
+        self.timeouts = 0
+
+    @property
+    def pool_size(self) -> int:
+        """Return the maximum number of connections."""
+        return self._pool_size
+
+    @property
+    def idle_connections(self) -> int:
+        """Return the number of idle connections."""
+        return len(self._idle)
+
+    def _create_connection(self, host: Any) -> http.client.HTTPConnection:
+        """Create a new http connection."""
+        chost, _, _ = self.get_host_info(host)
+        return http.client.HTTPConnection(chost, timeout=self._connection_timeout)
+
+    def _expire_idle_connections(self) -> None:
+        """Close idle connections exceeding the idle timeout. Lock must be held."""
+        deadline = time.monotonic() - self._idle_timeout
+        while self._idle and self._idle[0][1] < deadline:
+            connection, _ = self._idle.popleft()
+            connection.close()
+            self._open_connections -= 1
+
+    def _acquire(
+        self, host: Any, deadline: float | None = None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Check out a connection, waiting for a free slot if the pool is full."""
+        start = time.monotonic()
+        connection = None
+        with self._condition:
+            while True:
+                self._expire_idle_connections()
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    break
+                if self._open_connections < self._pool_size:
+                    self._open_connections += 1
+                    break
+                if deadline is None:
+                    self._condition.wait()
+                elif (remaining := deadline - time.monotonic()) <= 0 or not (
+                    self._condition.wait(remaining)
+                ):
+                    raise socket.timeout("No free connection")
+
+        reused = connection is not None
+        if connection is None:
+            try:
+                connection = self._create_connection(host)
+            except Exception:
+                with self._condition:
+                    self._open_connections -= 1
+                    self._condition.notify()
+                raise
+        self.metrics.record(time.monotonic() - start, reused)
+        return connection, reused
+
+    def _release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        """Return a connection to the pool or close it."""
+        with self._condition:
+            if reusable and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                connection.close()
+                self._open_connections -= 1
+            self._condition.notify()
+
+    def _discard_idle_connections(self) -> None:
+        """Close all idle connections."""
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                connection.close()
+                self._open_connections -= 1
+            self._condition.notify_all()
+
+    def single_request(
+        self, host: Any, handler: str, request_body: bytes, verbose: bool = False
+    ) -> Any:
+        """Issue an XML-RPC request within its deadline and the outbound limit."""
+        return self._limited_request(
+            host, handler, request_body, verbose, _parse_response
+        )
+
+    def stream_request(
+        self,
+        host: Any,
+        handler: str,
+        request_body: bytes,
+        on_item: Callable[[Any], None],
+    ) -> int:
+        """
+        Issue an XML-RPC request, whose result is an array of structs.
+        The structs are handed to the callback as soon as they are parsed,
+        instead of collecting the whole array. Return the number of items.
+        """
+        return self._limited_request(
+            host,
+            handler,
+            request_body,
+            False,
+            partial(_parse_streaming_response, on_item=on_item),
+        )
+
+    def _limited_request(
+        self,
+        host: Any,
+        handler: str,
+        request_body: bytes,
+        verbose: bool,
+        parse: _ResponseParser,
+    ) -> Any:
+        """Issue an XML-RPC request within its deadline and the outbound limit."""
+        method_name = get_method_name(request_body)
+        timeout = self.deadlines.get(get_operation(method_name)) or None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        request = partial(
+            self._single_request, host, handler, request_body, verbose, deadline, parse
+        )
+        try:
+            if self.limiter is None:
+                return request()
+            with self.limiter.limited(_FAILURE_TYPES, timeout):
+                return request()
+        except (socket.timeout, TimeoutError) as err:
+            if timeout is None:
+                raise
+            with self._condition:
+                self.timeouts += 1
+            raise RpcTimeoutError(
+                f"{method_name} exceeded its deadline of {timeout:.1f}s: {err}"
+            ) from err
+
+    def _single_request(
+        self,
+        host: Any,
+        handler: str,
+        request_body: bytes,
+        verbose: bool,
+        deadline: float | None = None,
+        parse: _ResponseParser | None = None,
+    ) -> Any:
+        """Issue an XML-RPC request on a pooled connection."""
+        connection, reused = self._acquire(host, deadline)
+        reusable = False
+        try:
+            if verbose:
+                connection.set_debuglevel(1)
+            _, extra_headers, _ = self.get_host_info(host)
+            _set_timeout(connection, deadline)
+            connection.putrequest("POST", handler, skip_accept_encoding=True)
+            self.send_headers(connection, self._headers + (extra_headers or []))
+            self.send_content(connection, request_body)
+            _set_timeout(connection, deadline)
+            response = connection.getresponse()
+            if response.status == 200:
+                self.verbose = verbose
+                # The remaining time is applied again before every read.
+                result = (parse or _parse_response)(
+                    response, partial(_set_timeout, connection, deadline)
+                )
+                reusable = not response.will_close
+                return result
+            if response.getheader("content-length", ""):
+                response.read()
+            reusable = not response.will_close
+            raise xmlrpc.client.ProtocolError(
+                host + handler,
+                response.status,
+                response.reason,
+                dict(response.getheaders()),
+            )
+        except (ConnectionError, http.client.HTTPException):
+            if reused:
+                # The CCU closed the keep-alive connection. Other idle
+                # connections are most likely stale as well.
+                self._discard_idle_connections()
+            raise
+        finally:
+            self._release(connection, reusable)
+
+    def close(self) -> None:
+        """Close all connections of the pool."""
+        with self._condition:
+            self._closed = True
+        self._discard_idle_connections()
+        super().close()
+
+
+class _StreamingUnmarshaller(xmlrpc.client.Unmarshaller):
+    """
+    Unmarshaller, that hands the structs of a top-level array to a
+    callback, so they can be processed and released one by one.
+    """
+
+    def __init__(self, on_item: Callable[[Any], None]) -> None:
+        super().__init__()
+        self._on_item = on_item
+        self._top_level_array = False
+        self.items = 0
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        """Remember, whether the outermost container is an array."""
+        if not self._marks and tag.split(":")[-1] in ("array", "struct"):
+            self._top_level_array = tag.split(":")[-1] == "array"
+        super().start(tag, attrs)
+
+    def end_struct(self, data: str) -> None:
+        """Hand a completed item of the top-level array to the callback."""
+        super().end_struct(data)
+        if self._top_level_array and len(self._marks) == 1:
+            self._on_item(self._stack.pop())
+            self.items += 1
+
+    dispatch = dict(xmlrpc.client.Unmarshaller.dispatch)
+    dispatch["struct"] = end_struct
+
+
+def _parse_response(
+    response: http.client.HTTPResponse, before_read: Callable[[], None]
+) -> Any:
+    """Parse a response, calling before_read before every read."""
+    parser, unmarshaller = xmlrpc.client.getparser()
+    _feed(parser, response, before_read)
+    return unmarshaller.close()
+
+
+def _parse_streaming_response(
+    response: http.client.HTTPResponse,
+    before_read: Callable[[], None],
+    on_item: Callable[[Any], None],
+) -> int:
+    """Parse a response incrementally and stream the items of its array."""
+    unmarshaller = _StreamingUnmarshaller(on_item)
+    parser = xmlrpc.client.ExpatParser(unmarshaller)
+    _feed(parser, response, before_read)
+    # Raises the fault of the response, if any.
+    unmarshaller.close()
+    return unmarshaller.items
+
+
+def _feed(
+    parser: xmlrpc.client.ExpatParser,
+    response: http.client.HTTPResponse,
+    before_read: Callable[[], None],
+) -> None:
+    """Feed a response to a parser, reading at most one chunk per socket read."""
+    while True:
+        before_read()
+        if not (data := response.read1(READ_CHUNK_SIZE)):
+            break
+        parser.feed(data)
+    parser.close()
+
+
+def _set_timeout(
+    connection: http.client.HTTPConnection, deadline: float | None
+) -> None:
+    """Limit the socket operations of a connection to the remaining time."""
+    timeout = socket.getdefaulttimeout()
+    if deadline is not None:
+        if (timeout := deadline - time.monotonic()) <= 0:
+            raise socket.timeout("Deadline exceeded")
+    connection.timeout = timeout
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)
+
+
+class PooledSafeTransport(PooledTransport):
+    """Pooled XML-RPC transport over TLS."""
+
+    def __init__(
+        self,
+        context: ssl.SSLContext,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            pool_size=pool_size,
+            idle_timeout=idle_timeout,
+            connection_timeout=connection_timeout,
+            **kwargs,
+        )
+        self._context = context
+
+    def _create_connection(self, host: Any) -> http.client.HTTPConnection:
+        """Create a new https connection."""
+        chost, _, x509 = self.get_host_info(host)
+        return http.client.HTTPSConnection(
+            chost,
+            timeout=self._connection_timeout,
+            context=self._context,
+            **(x509 or {}),
+        )
+
+
+def get_tls_context(verify_tls: bool) -> ssl.SSLContext:
+    """Return the ssl context for the outbound transport."""
+    if verify_tls:
+        return ssl.create_default_context()
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def stream_call(
+    proxy: xmlrpc.client.ServerProxy,
+    method: str,
+    params: tuple[Any, ...],
+    on_item: Callable[[Any], None],
+) -> int:
+    """
+    Call a method, that returns an array of structs, on the pooled
+    transport of a ServerProxy and stream the structs to a callback.
+    Blocks the calling thread.
+    """
+    # pylint: disable=protected-access
+    transport = getattr(proxy, _PROXY_TRANSPORT, None)
+    if not isinstance(transport, PooledTransport):
+        raise TypeError("Streaming requires the pooled transport")
+    encoding = proxy._ServerProxy__encoding  # type: ignore[attr-defined]
+    request_body = xmlrpc.client.dumps(
+        params,
+        method,
+        encoding=encoding,
+        allow_none=proxy._ServerProxy__allow_none,  # type: ignore[attr-defined]
+    ).encode(encoding, "xmlcharrefreplace")
+    return transport.stream_request(
+        proxy._ServerProxy__host,  # type: ignore[attr-defined]
+        proxy._ServerProxy__handler,  # type: ignore[attr-defined]
+        request_body,
+        on_item,
+    )
+
+
+def get_server_proxy(client: Any) -> xmlrpc.client.ServerProxy | None:
+    """
+    Return the XML-RPC proxy of a hahomematic client, None if unavailable.
+    The proxy and its transport are private, so they are only accessed
+    here and in install_pooled_transport.
+    """
+    # pylint: disable=protected-access
+    proxy = getattr(client, "_proxy", None)
+    if not isinstance(proxy, xmlrpc.client.ServerProxy):
+        return None
+    return proxy
+
+
+def install_pooled_transport(
+    proxy: xmlrpc.client.ServerProxy,
+    tls: bool,
+    verify_tls: bool,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+    limiter: AdaptiveLimiter | None = None,
+    deadlines: dict[str, float] | None = None,
+) -> PooledTransport | None:
+    """
+    Replace the transport of a ServerProxy with a pooled transport.
+    Return None and keep the default transport, if it can't be replaced.
+    """
+    if not isinstance(
+        old_transport := getattr(proxy, _PROXY_TRANSPORT, None),
+        xmlrpc.client.Transport,
+    ):
+        return None
+    transport: PooledTransport
+    if tls:
+        transport = PooledSafeTransport(
+            context=get_tls_context(verify_tls),
+            pool_size=pool_size,
+            idle_timeout=idle_timeout,
+        )
+    else:
+        transport = PooledTransport(pool_size=pool_size, idle_timeout=idle_timeout)
+    transport.limiter = limiter
+    if deadlines is not None:
+        transport.deadlines.update(deadlines)
+    setattr(proxy, _PROXY_TRANSPORT, transport)
+    old_transport.close()
+    return transport
@@ -0,0 +1,88 @@
+"""Sampling of high-frequency sensor values before they are written to HA."""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    """
+    Policy for writing sensor values.
+    A new value is written, if min_interval has elapsed and the value changed
+    by at least min_abs_delta or min_rel_delta. Independent of that, the
+    current value is written at least every heartbeat seconds.
+    """
+
+    min_interval: float = 0.0
+    min_abs_delta: float = 0.0
+    min_rel_delta: float = 0.0
+    heartbeat: float = 0.0
+
+    def with_overrides(
+        self,
+        min_interval: float | None = None,
+        min_abs_delta: float | None = None,
+        min_rel_delta: float | None = None,
+        heartbeat: float | None = None,
+    ) -> SamplingPolicy:
+        """Return the policy with the configured values replaced."""
+        changes: dict[str, float] = {}
+        if min_interval is not None:
+            changes["min_interval"] = min_interval
+        if min_abs_delta is not None:
+            changes["min_abs_delta"] = min_abs_delta
+        if min_rel_delta is not None:
+            changes["min_rel_delta"] = min_rel_delta
+        if heartbeat is not None:
+            changes["heartbeat"] = heartbeat
+        return replace(self, **changes)
+
+
+class Sampler:
+    """Decides which values of a sensor are written."""
+
+    def __init__(self, policy: SamplingPolicy) -> None:
+        self.policy = policy
+        self._last_value: Any = None
+        self._last_available: bool | None = None
+        self._last_time: float | None = None
+
+    @property
+    def last_time(self) -> float | None:
+        """Return the time of the last written value."""
+        return self._last_time
+
+    def should_write(self, value: Any, available: bool, now: float) -> bool:
+        """Return if the value is significant enough to be written."""
+        if (
+            self._last_time is None
+            or available != self._last_available
+            or not isinstance(value, (int, float))
+            or not isinstance(self._last_value, (int, float))
+        ):
+            return True
+
+        policy = self.policy
+        elapsed = now - self._last_time
+        if policy.heartbeat and elapsed >= policy.heartbeat:
+            return True
+        if elapsed < policy.min_interval:
+            return False
+
+        delta = abs(value - self._last_value)
+        if not policy.min_abs_delta and not policy.min_rel_delta:
+            return delta > 0
+        if policy.min_abs_delta and delta >= policy.min_abs_delta:
+            return True
+        if policy.min_rel_delta:
+            if not self._last_value:
+                return delta > 0
+            return delta / abs(self._last_value) >= policy.min_rel_delta
+        return False
+
+    def written(self, value: Any, available: bool, now: float) -> None:
+        """Remember the written value."""
+        self._last_value = value
+        self._last_available = available
+        self._last_time = now
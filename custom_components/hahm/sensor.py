@@ -3,19 +3,31 @@ from __future__ import annotations
 
 from datetime import timedelta
 import logging
+import time
 
 from hahomematic.const import HmPlatform
 from hahomematic.platforms.sensor import HmSensor
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import ENTITY_CATEGORY_DIAGNOSTIC
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import DOMAIN
-from .control_unit import ControlUnit
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_SAMPLING_ENABLED,
+    CONF_SAMPLING_HEARTBEAT,
+    CONF_SAMPLING_MIN_ABS_DELTA,
+    CONF_SAMPLING_MIN_INTERVAL,
+    CONF_SAMPLING_MIN_RELATIVE_DELTA,
+    DOMAIN,
+)
+from .control_unit import ControlUnit, ControlUnitMetric
 from .generic_entity import HaHomematicGenericEntity
+from .helper import get_sampling_policy
+from .sampling import Sampler, SamplingPolicy
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,6 +64,17 @@ async def async_setup_entry(
         if entities:
             async_add_entities(entities)
 
+    @callback
+    def async_add_metric_sensors(args):
+        """Add metric sensor from HAHM."""
+        entities = []
+
+        for metric in args[0]:
+            entities.append(HaHomematicMetricSensor(control_unit, metric))
+
+        if entities:
+            async_add_entities(entities)
+
     config_entry.async_on_unload(
         async_dispatcher_connect(
             hass,
@@ -69,7 +92,16 @@ async def async_setup_entry(
         )
     )
 
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            control_unit.async_signal_new_hm_entity(config_entry.entry_id, "metric"),
+            async_add_metric_sensors,
+        )
+    )
+
     async_add_sensor([control_unit.get_hm_entities_by_platform(HmPlatform.SENSOR)])
+    async_add_metric_sensors([control_unit.metrics])
 
 
 class HaHomematicSensor(HaHomematicGenericEntity, SensorEntity):
@@ -77,10 +109,77 @@ class HaHomematicSensor(HaHomematicGenericEntity, SensorEntity):
 
     _hm_entity: HmSensor
 
+    def __init__(self, control_unit: ControlUnit, hm_entity) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(control_unit, hm_entity)
+        self._sampler: Sampler | None = None
+        if policy := _get_sampling_policy(control_unit, hm_entity):
+            self._sampler = Sampler(policy)
+        self._cancel_recheck: CALLBACK_TYPE | None = None
+
     @property
     def native_value(self):
         return self._hm_entity.state
 
+    @callback
+    def _async_device_changed(self, *args, **kwargs) -> None:
+        """Handle device state changes, skipping insignificant values."""
+        if self._sampler is None or not self.enabled:
+            super()._async_device_changed(*args, **kwargs)
+            return
+        value, available, now = self.native_value, self.available, time.monotonic()
+        if not self._sampler.should_write(value, available, now):
+            self._async_schedule_recheck()
+            return
+        self._sampler.written(value, available, now)
+        super()._async_device_changed(*args, **kwargs)
+
+    @callback
+    def _async_schedule_recheck(self) -> None:
+        """Re-evaluate a skipped value, when the interval or heartbeat elapses."""
+        if self._cancel_recheck is not None or self._sampler.last_time is None:
+            return
+        policy = self._sampler.policy
+        elapsed = time.monotonic() - self._sampler.last_time
+        if elapsed < policy.min_interval:
+            delay = policy.min_interval - elapsed
+        elif policy.heartbeat:
+            delay = policy.heartbeat - elapsed
+        else:
+            return
+        self._cancel_recheck = async_call_later(
+            self.hass, max(0, delay), self._async_recheck
+        )
+
+    @callback
+    def _async_recheck(self, now) -> None:
+        """Write the current value, if it is significant by now."""
+        self._cancel_recheck = None
+        self._async_device_changed()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending re-evaluation."""
+        if self._cancel_recheck:
+            self._cancel_recheck()
+            self._cancel_recheck = None
+        await super().async_will_remove_from_hass()
+
+
+def _get_sampling_policy(control_unit: ControlUnit, hm_entity) -> SamplingPolicy | None:
+    """Return the sampling policy of a sensor with the configured overrides."""
+    options = control_unit.options
+    if not options.get(CONF_SAMPLING_ENABLED, True):
+        return None
+    if (policy := get_sampling_policy(hm_entity)) is None:
+        return None
+    min_rel_delta = options.get(CONF_SAMPLING_MIN_RELATIVE_DELTA)
+    return policy.with_overrides(
+        min_interval=options.get(CONF_SAMPLING_MIN_INTERVAL),
+        min_abs_delta=options.get(CONF_SAMPLING_MIN_ABS_DELTA),
+        min_rel_delta=min_rel_delta / 100 if min_rel_delta is not None else None,
+        heartbeat=options.get(CONF_SAMPLING_HEARTBEAT),
+    )
+
 
 class HaHomematicHubSensor(HaHomematicGenericEntity, SensorEntity):
     """Representation of the HomematicIP sensor entity."""
@@ -103,3 +202,28 @@ class HaHomematicHubSensor(HaHomematicGenericEntity, SensorEntity):
     async def async_update(self):
         """Update the hub and all entities."""
         await self._hm_entity.fetch_data()
+
+
+class HaHomematicMetricSensor(SensorEntity):
+    """Representation of a runtime metric of the control unit."""
+
+    _attr_entity_category = ENTITY_CATEGORY_DIAGNOSTIC
+    # Metrics are polled, so they are only updated, if enabled by the user.
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, control_unit: ControlUnit, metric: ControlUnitMetric) -> None:
+        """Initialize the metric sensor."""
+        self._metric = metric
+        self._attr_name = metric.name
+        self._attr_unique_id = f"{control_unit.instance_name}_{metric.key}"
+        self._attr_native_unit_of_measurement = metric.unit
+
+    @property
+    def native_value(self):
+        """Return the current value of the metric."""
+        return self._metric.value
+
+    @property
+    def extra_state_attributes(self):
+        """Return the additional values of the metric."""
+        return self._metric.attributes
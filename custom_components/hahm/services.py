@@ -1,8 +1,11 @@
 """ hahomematic services """
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
 from datetime import datetime
 import logging
+from typing import Any
 
 from hahomematic.const import (
     ATTR_ADDRESS,
@@ -17,6 +20,8 @@ import voluptuous as vol
 
 from homeassistant.const import ATTR_ENTITY_ID, ATTR_MODE, ATTR_TIME
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
@@ -24,14 +29,22 @@ from .const import (
     ATTR_PARAMSET_KEY,
     ATTR_RX_MODE,
     ATTR_VALUE_TYPE,
+    ATTR_VALUES,
+    ATTR_VIRTUAL_KEY_ADDRESS,
+    ATTR_VIRTUAL_KEY_PARAMETER,
+    ATTR_WAIT_FOR_ACK,
     DOMAIN,
     SERVICE_PUT_PARAMSET,
+    SERVICE_REFRESH_MASTER_PARAMSET,
+    SERVICE_SEND_GROUP_VALUE,
     SERVICE_SET_DEVICE_VALUE,
     SERVICE_SET_INSTALL_MODE,
     SERVICE_SET_VARIABLE_VALUE,
+    SERVICE_SET_VARIABLE_VALUES,
     SERVICE_VIRTUAL_KEY,
 )
-from .control_unit import ControlUnit
+from .control_unit import PARAM_CONFIG_PENDING, ControlUnit
+from .paramset_cache import PARAMSET_KEY_MASTER
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,6 +64,15 @@ SCHEMA_SERVICE_SET_VARIABLE_VALUE = vol.Schema(
     }
 )
 
+SCHEMA_SERVICE_SET_VARIABLE_VALUES = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.string,
+        vol.Required(ATTR_VALUES): vol.All(
+            {cv.string: cv.match_all}, vol.Length(min=1)
+        ),
+    }
+)
+
 SCHEMA_SERVICE_SET_DEVICE_VALUE = vol.Schema(
     {
         vol.Required(ATTR_INTERFACE_ID): cv.string,
@@ -61,6 +83,23 @@ SCHEMA_SERVICE_SET_DEVICE_VALUE = vol.Schema(
             ["boolean", "dateTime.iso8601", "double", "int", "string"]
         ),
         vol.Optional(ATTR_INTERFACE_ID): cv.string,
+        vol.Optional(ATTR_WAIT_FOR_ACK): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=600)
+        ),
+    }
+)
+
+SCHEMA_SERVICE_SEND_GROUP_VALUE = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_PARAMETER): vol.All(cv.string, vol.Upper),
+        vol.Required(ATTR_VALUE): cv.match_all,
+        vol.Inclusive(ATTR_VIRTUAL_KEY_ADDRESS, "virtual_key"): vol.All(
+            cv.string, vol.Upper
+        ),
+        vol.Inclusive(ATTR_VIRTUAL_KEY_PARAMETER, "virtual_key"): vol.All(
+            cv.string, vol.Upper
+        ),
     }
 )
 
@@ -80,6 +119,16 @@ SCHEMA_SERVICE_PUT_PARAMSET = vol.Schema(
         vol.Required(ATTR_PARAMSET_KEY): vol.All(cv.string, vol.Upper),
         vol.Required(ATTR_PARAMSET): dict,
         vol.Optional(ATTR_RX_MODE): vol.All(cv.string, vol.Upper),
+        vol.Optional(ATTR_WAIT_FOR_ACK): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=600)
+        ),
+    }
+)
+
+SCHEMA_SERVICE_REFRESH_MASTER_PARAMSET = vol.Schema(
+    {
+        vol.Required(ATTR_INTERFACE_ID): cv.string,
+        vol.Required(ATTR_ADDRESS): vol.All(cv.string, vol.Upper),
     }
 )
 
@@ -109,8 +158,9 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         name = service.data[ATTR_NAME]
         value = service.data[ATTR_VALUE]
 
-        if hub := _get_hub_by_entity_id(hass, entity_id):
-            await hub.set_variable(name, value)
+        if (hub := _get_hub_by_entity_id(hass, entity_id)) is None:
+            raise HomeAssistantError(f"{entity_id} is not a hahm hub")
+        await hub.set_variable(name, value)
 
     hass.services.async_register(
         domain=DOMAIN,
@@ -119,6 +169,22 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SCHEMA_SERVICE_SET_VARIABLE_VALUE,
     )
 
+    async def _service_set_variable_values(service: ServiceCall):
+        """Service to set multiple HomeMatic system variables at once."""
+        entity_id = service.data[ATTR_ENTITY_ID]
+        values = dict(service.data[ATTR_VALUES])
+
+        if (hub := _get_hub_by_entity_id(hass, entity_id)) is None:
+            raise HomeAssistantError(f"{entity_id} is not a hahm hub")
+        await hub.set_variables(values)
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_SET_VARIABLE_VALUES,
+        service_func=_service_set_variable_values,
+        schema=SCHEMA_SERVICE_SET_VARIABLE_VALUES,
+    )
+
     async def _service_set_device_value(service: ServiceCall):
         """Service to call setValue method for HomeMatic devices."""
         interface_id = service.data[ATTR_INTERFACE_ID]
@@ -148,7 +214,24 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             _LOGGER.error("%s not found!", address)
             return
 
-        await hm_entity.send_value(value)
+        control_unit = _get_cu_by_interface_id(hass, interface_id)
+
+        async def _send_value() -> None:
+            if control_unit.is_compacting(interface_id):
+                # Merged with the values sent to the channel within the window.
+                await control_unit.set_value(interface_id, address, parameter, value)
+            else:
+                await hm_entity.send_value(value)
+
+        if (timeout := service.data.get(ATTR_WAIT_FOR_ACK)) is None:
+            await _send_value()
+            return
+
+        expected = [
+            control_unit.expect_event(address, parameter, match=_reports_value(value))
+        ]
+        async with control_unit.acks.async_acknowledged(expected, timeout):
+            await _send_value()
 
     hass.services.async_register(
         domain=DOMAIN,
@@ -157,6 +240,73 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SCHEMA_SERVICE_SET_DEVICE_VALUE,
     )
 
+    async def _service_send_group_value(service: ServiceCall):
+        """Service to send a value to a group of entities."""
+        entity_ids = service.data[ATTR_ENTITY_ID]
+        parameter = service.data[ATTR_PARAMETER]
+        value = service.data[ATTR_VALUE]
+
+        # Split the group by control unit.
+        groups: dict[str, tuple[ControlUnit, list[GenericEntity]]] = {}
+        entity_ids_by_hm_entity: dict[str, str] = {}
+        unknown: list[str] = []
+        entity_registry = er.async_get(hass)
+        for entity_id in entity_ids:
+            if (entry := entity_registry.async_get(entity_id)) is None or (
+                control_unit := hass.data[DOMAIN].get(entry.config_entry_id)
+            ) is None:
+                unknown.append(entity_id)
+                continue
+            if (
+                hm_entity := _get_hm_entity_for_parameter(
+                    control_unit, entry.unique_id, parameter
+                )
+            ) is None:
+                unknown.append(entity_id)
+                continue
+            entity_ids_by_hm_entity[hm_entity.unique_id] = entity_id
+            groups.setdefault(entry.config_entry_id, (control_unit, []))[1].append(
+                hm_entity
+            )
+        if unknown:
+            raise HomeAssistantError(
+                f"No hahm entity with parameter {parameter}: {', '.join(unknown)}"
+            )
+
+        # A virtual key is pressed on the CCU it belongs to, independent of
+        # the CCUs of the entities. The values are only sent, if no CCU knows it.
+        if virtual_key_address := service.data.get(ATTR_VIRTUAL_KEY_ADDRESS):
+            for control_unit in hass.data[DOMAIN].values():
+                if control_unit.central and control_unit.has_hm_device(
+                    virtual_key_address
+                ):
+                    await control_unit.press_virtual_key(
+                        virtual_key_address, service.data[ATTR_VIRTUAL_KEY_PARAMETER]
+                    )
+                    return
+
+        results = await asyncio.gather(
+            *(
+                control_unit.send_group_value(hm_entities, value)
+                for control_unit, hm_entities in groups.values()
+            )
+        )
+        if failed := [
+            entity_ids_by_hm_entity[hm_entity.unique_id]
+            for hm_entities in results
+            for hm_entity in hm_entities
+        ]:
+            raise HomeAssistantError(
+                f"Sending {parameter} failed for: {', '.join(failed)}"
+            )
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_SEND_GROUP_VALUE,
+        service_func=_service_send_group_value,
+        schema=SCHEMA_SERVICE_SEND_GROUP_VALUE,
+    )
+
     async def _service_set_install_mode(service: ServiceCall):
         """Service to set interface_id into install mode."""
         interface_id = service.data[ATTR_INTERFACE_ID]
@@ -196,10 +346,37 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             rx_mode,
         )
 
-        if control_unit := _get_cu_by_interface_id(hass, interface_id):
+        if (control_unit := _get_cu_by_interface_id(hass, interface_id)) is None:
+            return
+
+        expected = []
+        if (timeout := service.data.get(ATTR_WAIT_FOR_ACK)) is not None:
+            if paramset_key == PARAMSET_KEY_MASTER:
+                # The device reports the applied configuration by CONFIG_PENDING.
+                expected.append(
+                    control_unit.expect_event(
+                        f"{address.split(':')[0]}:0",
+                        PARAM_CONFIG_PENDING,
+                        match=lambda value: not value,
+                    )
+                )
+            else:
+                # Write-only parameters like ON_TIME are never reported.
+                expected.extend(
+                    control_unit.expect_event(
+                        address, parameter, match=_reports_value(paramset[parameter])
+                    )
+                    for parameter in control_unit.get_event_parameters(
+                        interface_id, address, paramset_key, paramset
+                    )
+                )
+
+        async with control_unit.acks.async_acknowledged(expected, timeout or 0):
             await control_unit.central.put_paramset(
                 interface_id, address, paramset_key, paramset, rx_mode
             )
+            if paramset_key == PARAMSET_KEY_MASTER:
+                control_unit.async_invalidate_master_paramsets(address)
 
     hass.services.async_register(
         domain=DOMAIN,
@@ -208,6 +385,27 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SCHEMA_SERVICE_PUT_PARAMSET,
     )
 
+    async def _service_refresh_master_paramset(service: ServiceCall):
+        """Service to re-read the MASTER paramset of a channel."""
+        interface_id = service.data[ATTR_INTERFACE_ID]
+        address = service.data[ATTR_ADDRESS]
+
+        if control_unit := _get_cu_by_interface_id(hass, interface_id):
+            control_unit.async_invalidate_master_paramsets(address)
+            await control_unit.master_paramsets.async_refresh(interface_id, address)
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_REFRESH_MASTER_PARAMSET,
+        service_func=_service_refresh_master_paramset,
+        schema=SCHEMA_SERVICE_REFRESH_MASTER_PARAMSET,
+    )
+
+
+def _reports_value(value: Any) -> Callable[[Any], bool]:
+    """Return a match for the events, that report the sent value."""
+    return lambda reported: reported == value
+
 
 def _get_hm_entity(
     hass: HomeAssistant, interface_id: str, address: str, parameter: str
@@ -218,6 +416,19 @@ def _get_hm_entity(
     return None
 
 
+def _get_hm_entity_for_parameter(
+    control_unit: ControlUnit, unique_id: str, parameter: str
+) -> GenericEntity | None:
+    """Get the hm-entity of the parameter on the channel of an active entity."""
+    if (hm_entity := control_unit.get_active_hm_entity(unique_id)) is None:
+        return None
+    if getattr(hm_entity, "parameter", None) == parameter:
+        return hm_entity
+    return control_unit.central.get_hm_entity_by_parameter(
+        hm_entity.address, parameter
+    )
+
+
 def _get_cu_by_interface_id(
     hass: HomeAssistant, interface_id: str
 ) -> ControlUnit | None:
@@ -225,7 +436,7 @@ def _get_cu_by_interface_id(
     Get ControlUnit by device address
     """
     for control_unit in hass.data[DOMAIN].values():
-        if control_unit.central.clients.get(interface_id):
+        if control_unit.central and control_unit.central.clients.get(interface_id):
             return control_unit
     return None
 
@@ -235,6 +446,6 @@ def _get_hub_by_entity_id(hass: HomeAssistant, entity_id: str) -> HmHub | None:
     Get ControlUnit by device address
     """
     for control_unit in hass.data[DOMAIN].values():
-        if control_unit.hub.entity_id == entity_id:
+        if control_unit.hub and control_unit.hub.entity_id == entity_id:
             return control_unit.hub
     return None
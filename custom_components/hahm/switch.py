@@ -15,9 +15,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .const import DOMAIN
 from .control_unit import ControlUnit
 from .generic_entity import HaHomematicGenericEntity
+from .optimistic import OptimisticState
 
 _LOGGER = logging.getLogger(__name__)
 
+_PARAM_STATE = "STATE"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -55,16 +58,26 @@ class HaHomematicSwitch(HaHomematicGenericEntity, SwitchEntity):
     """Representation of the HomematicIP switch entity."""
 
     _hm_entity: HmSwitch
+    _optimistic: OptimisticState
+
+    def __init__(self, control_unit: ControlUnit, hm_entity) -> None:
+        """Initialize the switch entity."""
+        super().__init__(control_unit, hm_entity)
+        self._init_optimistic_state().track(
+            _PARAM_STATE, lambda: self._hm_entity.state
+        )
 
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self._hm_entity.state
+        return self._optimistic.get(_PARAM_STATE)
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
-        await self._hm_entity.turn_on()
+        async with self._async_command(_PARAM_STATE, True):
+            await self._hm_entity.turn_on()
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
-        await self._hm_entity.turn_off()
+        async with self._async_command(_PARAM_STATE, False):
+            await self._hm_entity.turn_off()
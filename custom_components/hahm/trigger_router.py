@@ -0,0 +1,96 @@
+"""Router for the device triggers of click events."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.const import CONF_ADDRESS, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+
+from .const import CONF_INTERFACE_ID, DOMAIN
+
+DATA_TRIGGER_ROUTER = f"{DOMAIN}_trigger_router"
+
+TriggerKey = tuple[str, str, str]
+
+
+class _Trigger:
+    """Attached device trigger."""
+
+    def __init__(
+        self, event_type: str, job: HassJob, trigger_data: Mapping[str, Any]
+    ) -> None:
+        self.event_type = event_type
+        self.job = job
+        self.trigger_data = trigger_data
+
+
+class TriggerRouter:
+    """
+    Dispatches click events to the attached device triggers.
+    Triggers are looked up by interface_id, address and type, instead of
+    matching every event on the bus against the event data of every trigger.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._triggers: dict[TriggerKey, list[_Trigger]] = {}
+
+    @property
+    def trigger_count(self) -> int:
+        """Return the number of attached triggers."""
+        return sum(len(triggers) for triggers in self._triggers.values())
+
+    @callback
+    def async_attach(
+        self,
+        key: TriggerKey,
+        event_type: str,
+        job: HassJob,
+        trigger_data: Mapping[str, Any],
+    ) -> CALLBACK_TYPE:
+        """Attach a trigger and return the callback to detach it."""
+        trigger = _Trigger(event_type, job, trigger_data)
+        self._triggers.setdefault(key, []).append(trigger)
+
+        @callback
+        def _remove() -> None:
+            if (triggers := self._triggers.get(key)) is None:
+                return
+            if trigger in triggers:
+                triggers.remove(trigger)
+            if not triggers:
+                del self._triggers[key]
+
+        return _remove
+
+    @callback
+    def async_dispatch(self, event: Event) -> None:
+        """Run the triggers attached to the key of a click event."""
+        data = event.data
+        key = (data.get(CONF_INTERFACE_ID), data.get(CONF_ADDRESS), data.get(CONF_TYPE))
+        if (triggers := self._triggers.get(key)) is None:  # type: ignore[arg-type]
+            return
+        for trigger in list(triggers):
+            if trigger.event_type != event.event_type:
+                continue
+            self._hass.async_run_hass_job(
+                trigger.job,
+                {
+                    "trigger": {
+                        **trigger.trigger_data,
+                        "platform": "device",
+                        "event": event,
+                        "description": f"event '{event.event_type}'",
+                    }
+                },
+                event.context,
+            )
+
+
+@callback
+def get_trigger_router(hass: HomeAssistant) -> TriggerRouter:
+    """Return the trigger router shared by all control units."""
+    if (router := hass.data.get(DATA_TRIGGER_ROUTER)) is None:
+        router = hass.data[DATA_TRIGGER_ROUTER] = TriggerRouter(hass)
+    return router
@@ -0,0 +1,89 @@
+"""Tests for the liveness tracking of devices."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.hahm import liveness
+from custom_components.hahm.liveness import (
+    MIN_SAMPLES,
+    TICK_INTERVAL,
+    DeviceLiveness,
+    TimerWheel,
+)
+
+ADDRESS = "VCU0000001"
+DEVICE_TYPE = "HmIP-STHO"
+
+
+class FakeClock:
+    """Monotonic clock, that is advanced by the test."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the monotonic clock of the liveness module."""
+    fake = FakeClock()
+    monkeypatch.setattr(liveness.time, "monotonic", fake)
+    return fake
+
+
+def _report(tracker: DeviceLiveness, clock: FakeClock, parameters: int) -> None:
+    """Feed a cyclic report with events of several parameters."""
+    for _ in range(parameters):
+        tracker.seen(ADDRESS)
+        clock.now += 0.002
+
+
+def _advance(tracker: DeviceLiveness, clock: FakeClock, seconds: float) -> list[str]:
+    """Advance the clock tick by tick and return the expired devices."""
+    expired: list[str] = []
+    for _ in range(int(seconds / TICK_INTERVAL)):
+        clock.now += TICK_INTERVAL
+        expired.extend(tracker.expire())
+    return expired
+
+
+def test_multi_parameter_reports_learn_the_cycle(clock: FakeClock) -> None:
+    """Test that the events of a report count as a single report."""
+    tracker = DeviceLiveness(TimerWheel())
+    tracker.track(ADDRESS, DEVICE_TYPE)
+    for _ in range(MIN_SAMPLES + 1):
+        _report(tracker, clock, parameters=4)
+        _advance(tracker, clock, 300)
+
+    learned = tracker.as_dict()["learned_intervals"]
+    assert learned[DEVICE_TYPE] == 300
+    assert tracker._types[DEVICE_TYPE].stale_timeout == pytest.approx(900, abs=1)
+
+
+def test_multi_parameter_reports_go_stale(clock: FakeClock) -> None:
+    """Test that a device with multi-parameter reports is stale, when they stop."""
+    tracker = DeviceLiveness(TimerWheel())
+    tracker.track(ADDRESS, DEVICE_TYPE)
+    for _ in range(MIN_SAMPLES + 1):
+        _report(tracker, clock, parameters=4)
+        _advance(tracker, clock, 300)
+
+    assert _advance(tracker, clock, 500) == []
+    assert _advance(tracker, clock, 200) == [ADDRESS]
+    assert tracker.is_stale(ADDRESS)
+
+    assert tracker.seen(ADDRESS) is True
+    assert not tracker.is_stale(ADDRESS)
+
+
+def test_irregular_reports_are_not_cyclic(clock: FakeClock) -> None:
+    """Test that event-driven devices don't get a stale timeout."""
+    tracker = DeviceLiveness(TimerWheel())
+    tracker.track(ADDRESS, DEVICE_TYPE)
+    for index in range(MIN_SAMPLES * 2):
+        _report(tracker, clock, parameters=2)
+        _advance(tracker, clock, 60 * (1 + index % 7) ** 2)
+
+    assert tracker.as_dict()["learned_intervals"] == {}
@@ -0,0 +1,69 @@
+"""Tests for the streaming parser of XML-RPC responses."""
+from __future__ import annotations
+
+import io
+from typing import Any
+import xmlrpc.client
+
+import pytest
+
+from custom_components.hahm import rpc_transport
+from custom_components.hahm.rpc_transport import _parse_streaming_response
+
+DESCRIPTIONS = [
+    {"ADDRESS": "VCU0000001", "CHILDREN": ["VCU0000001:0", "VCU0000001:1"]},
+    {"ADDRESS": "VCU0000001:0", "PARENT": "VCU0000001", "CHILDREN": []},
+    {"ADDRESS": "VCU0000001:1", "PARENT": "VCU0000001", "CHILDREN": []},
+]
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Split the responses into many reads."""
+    monkeypatch.setattr(rpc_transport, "READ_CHUNK_SIZE", 16)
+
+
+def _parse(body: str) -> tuple[int, list[Any], int]:
+    """Parse a response body, return the item count, items and reads."""
+    items: list[Any] = []
+    reads = 0
+
+    def _before_read() -> None:
+        nonlocal reads
+        reads += 1
+
+    count = _parse_streaming_response(
+        io.BytesIO(body.encode()), _before_read, items.append
+    )
+    return count, items, reads
+
+
+def test_streams_the_structs_of_the_array() -> None:
+    """Test that every struct of the array is handed over in order."""
+    body = xmlrpc.client.dumps((DESCRIPTIONS,), methodresponse=True)
+
+    count, items, reads = _parse(body)
+
+    assert count == len(DESCRIPTIONS)
+    assert items == DESCRIPTIONS
+    assert reads > 1
+
+
+def test_empty_array() -> None:
+    """Test a response without items."""
+    body = xmlrpc.client.dumps(([],), methodresponse=True)
+
+    assert _parse(body)[:2] == (0, [])
+
+
+def test_fault_raises() -> None:
+    """Test that a fault response raises and hands over no items."""
+    body = xmlrpc.client.dumps(xmlrpc.client.Fault(-1, "Failure"))
+    items: list[Any] = []
+
+    with pytest.raises(xmlrpc.client.Fault) as err:
+        _parse_streaming_response(io.BytesIO(body.encode()), lambda: None, items.append)
+
+    assert err.value.faultCode == -1
+    assert err.value.faultString == "Failure"
+    assert items == []